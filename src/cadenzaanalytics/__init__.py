@@ -17,9 +17,13 @@ from cadenzaanalytics.data.analytics_extension import AnalyticsExtension
 from cadenzaanalytics.data.attribute_group import AttributeGroup
 from cadenzaanalytics.data.attribute_role import AttributeRole
 from cadenzaanalytics.data.column_metadata import ColumnMetadata
+from cadenzaanalytics.data.column_stats import ColumnStats
 from cadenzaanalytics.data.data_type import DataType
+from cadenzaanalytics.data.dtype_backend import DtypeBackend
 from cadenzaanalytics.data.table import Table
 from cadenzaanalytics.data.extension_type import ExtensionType
+from cadenzaanalytics.data.float_precision import FloatPrecision
+from cadenzaanalytics.data.geometry_precision import GeometryPrecision
 from cadenzaanalytics.data.geometry_type import GeometryType
 from cadenzaanalytics.data.measure_aggregation import MeasureAggregation
 from cadenzaanalytics.data.parameter import Parameter
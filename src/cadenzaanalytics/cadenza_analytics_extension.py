@@ -1,30 +1,40 @@
 """Represents a disy Cadenza analytics extension and holds its configuration. In connection with the
 `CadenzaAnalyticsExtensionService` the extension handles the processing of analytics requests when
 invoked via HTTP POST on the relative path."""
+import io
 import json
 import logging
+import mmap
+import tempfile
+from concurrent.futures import Executor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Callable, List, Optional
+from typing import BinaryIO, Callable, Iterator, List, Optional, Union
 from tzlocal import get_localzone_name
 
 from flask import Response, request
+from pandas import DataFrame
 
 from cadenzaanalytics.data.analytics_extension import AnalyticsExtension
+from cadenzaanalytics.data.attribute_group import AttributeGroup
+from cadenzaanalytics.data.attribute_role import AttributeRole
 from cadenzaanalytics.data.extension_type import ExtensionType
 from cadenzaanalytics.data.parameter import Parameter
 from cadenzaanalytics.data.data_type import DataType
+from cadenzaanalytics.data.dtype_backend import DtypeBackend
 from cadenzaanalytics.data.table import Table
 from cadenzaanalytics.request.analytics_request import AnalyticsRequest
 from cadenzaanalytics.request.request_parameter import RequestParameter
 from cadenzaanalytics.request.request_metadata import RequestMetadata
 from cadenzaanalytics.request.request_table import RequestTable
 from cadenzaanalytics.response.extension_response import ExtensionResponse
-from cadenzaanalytics.util.csv import from_cadenza_csv
+from cadenzaanalytics.util.csv import PARALLEL_THRESHOLD, PYARROW_THRESHOLD, parse_cadenza_csv
 
 
 logger = logging.getLogger('cadenzaanalytics')
 
 
+# pylint: disable=too-many-instance-attributes
 class CadenzaAnalyticsExtension:
     """Represents a Cadenza analytics extension.
 
@@ -33,13 +43,23 @@ class CadenzaAnalyticsExtension:
     and configuration for expected input tables and parameters.
     """
 
+    # pylint: disable=too-many-arguments,too-many-locals
     def __init__(self, *,
                  relative_path: str,
                  analytics_function: Callable[[AnalyticsRequest], ExtensionResponse],
                  print_name: str,
                  extension_type: ExtensionType,
                  tables: Optional[List[Table]] = None,
-                 parameters: Optional[List[Parameter]] = None) -> None:
+                 parameters: Optional[List[Parameter]] = None,
+                 max_workers: Optional[int] = None,
+                 parallel_threshold: int = PARALLEL_THRESHOLD,
+                 lazy_data: bool = False,
+                 categorical_dimensions: bool = False,
+                 dtype_backend: Optional[DtypeBackend] = None,
+                 pyarrow_threshold: Optional[int] = PYARROW_THRESHOLD,
+                 executor: Optional[Executor] = None,
+                 column_stats: bool = False,
+                 downcast_numbers: bool = False) -> None:
         """Initialize a CadenzaAnalyticsExtension.
 
         Parameters
@@ -56,6 +76,32 @@ class CadenzaAnalyticsExtension:
             List of input data tables. At most one table is supported.
         parameters : Optional[List[Parameter]], optional
             List of user-configurable parameters.
+        max_workers : Optional[int], optional
+            Maximum number of threads that parse a large column of the request data in parallel,
+            defaults to the number of CPUs. With 1, request data is parsed on the request thread only.
+        parallel_threshold : int, optional
+            Minimum number of rows of the request data for a column to be parsed in parallel.
+        lazy_data : bool, optional
+            Whether text, datetime and geometry columns of the request data are only converted when
+            the analytics function reads them, via `RequestTable.select` or `RequestTable.data`.
+            Invalid values are then reported when a column is read.
+        categorical_dimensions : bool, optional
+            Whether text columns with the role dimension are parsed as pandas Categorical instead of
+            strings, which saves memory and speeds up grouping if they have few distinct values.
+        dtype_backend : Optional[DtypeBackend], optional
+            The dtypes the columns of the request data are parsed into, see `dtype_backend`.
+        pyarrow_threshold : Optional[int], optional
+            Minimum size in bytes of the request data for it to be parsed by the CSV reader of pyarrow,
+            if pyarrow is installed. With None, request data is always parsed by the Python parser.
+        executor : Optional[Executor], optional
+            Executor on which the Python parser parses segments of large request data in parallel,
+            e.g. a ProcessPoolExecutor, see `from_cadenza_csv`.
+        column_stats : bool, optional
+            Whether statistics of the columns of the request data are collected while it is parsed,
+            see `RequestTable.stats`.
+        downcast_numbers : bool, optional
+            Whether numeric columns of the request data are stored in the narrowest type that holds their
+            values, e.g. int16 or float32, see `from_cadenza_csv`.
 
         Raises
         ------
@@ -65,6 +111,15 @@ class CadenzaAnalyticsExtension:
 
         self._relative_path = relative_path
         self._analytics_function = analytics_function
+        self._max_workers = max_workers
+        self._parallel_threshold = parallel_threshold
+        self._lazy_data = lazy_data
+        self._categorical_dimensions = categorical_dimensions
+        self._dtype_backend = dtype_backend
+        self._pyarrow_threshold = pyarrow_threshold
+        self._executor = executor
+        self._column_stats = column_stats
+        self._downcast_numbers = downcast_numbers
 
         attribute_groups = []
         if tables is None:
@@ -74,8 +129,10 @@ class CadenzaAnalyticsExtension:
         if len(tables) == 1:
             attribute_groups = tables[0].attribute_groups
             self._table_name = tables[0].name
+            self._projection = tables[0].projection
         else:
             self._table_name = None
+            self._projection = None
         self._analytics_extension = AnalyticsExtension(print_name, extension_type, attribute_groups, parameters)
 
 
@@ -112,6 +169,25 @@ class CadenzaAnalyticsExtension:
         """
         return self._analytics_extension.extension_type
 
+    @property
+    def dtype_backend(self) -> Optional[DtypeBackend]:
+        """Getter for the dtypes the columns of the request data are parsed into.
+
+        If None, the default of the `CadenzaAnalyticsExtensionService` the extension is added to applies,
+        otherwise `DtypeBackend.NUMPY_NULLABLE`.
+
+        Returns
+        -------
+        Optional[DtypeBackend]
+            The dtype backend of the extension.
+        """
+        return self._dtype_backend
+
+    @dtype_backend.setter
+    def dtype_backend(self, value: Optional[DtypeBackend]) -> None:
+        """Setter for the dtypes the columns of the request data are parsed into."""
+        self._dtype_backend = value
+
     def handle_request(self) -> Response:
         """Handle the processing of extension requests.
 
@@ -143,6 +219,8 @@ class CadenzaAnalyticsExtension:
 
         metadata_dict = json.loads(self._get_from_request(multipart_request, 'metadata'))
         logger.debug('Received metadata:\n%s', metadata_dict)
+        if self._projection is not None:
+            metadata_dict = self._project_metadata(metadata_dict)
 
         metadata = RequestMetadata(metadata_dict)
         parameters = RequestParameter(metadata_dict['parameters'])
@@ -152,28 +230,47 @@ class CadenzaAnalyticsExtension:
             type_mapping = {}
             datetime_columns = []
             geometry_columns = []
+            categorical_columns = []
 
             for column in metadata.columns:
                 if column.data_type == DataType.ZONEDDATETIME:
                     datetime_columns.append(column.name)
                 elif column.data_type == DataType.GEOMETRY:
                     geometry_columns.append(column.name)
+                elif (self._categorical_dimensions and column.data_type == DataType.STRING
+                      and column.role == AttributeRole.DIMENSION):
+                    categorical_columns.append(column.name)
 
                 type_mapping[column.name] = column.data_type.pandas_type()
 
-            csv_data = self._get_from_request(multipart_request, 'data')
-            # Use custom parser that properly handles quoted vs unquoted values
-            df_data = from_cadenza_csv(
-                csv_data,
-                type_mapping=type_mapping,
-                datetime_columns=datetime_columns,
-                geometry_columns=geometry_columns
-            )
-
-            logger.debug('Received data:\n%s', df_data.head())
+            with self._open_csv_source(multipart_request, 'data') as csv_data:
+                # Use custom parser that properly handles quoted vs unquoted values
+                columns = parse_cadenza_csv(
+                    csv_data,
+                    type_mapping=type_mapping,
+                    datetime_columns=datetime_columns,
+                    geometry_columns=geometry_columns,
+                    max_workers=self._max_workers,
+                    parallel_threshold=self._parallel_threshold,
+                    columns=None if self._projection is None else list(metadata),
+                    categorical_columns=categorical_columns,
+                    dtype_backend=self._dtype_backend or DtypeBackend.NUMPY_NULLABLE,
+                    pyarrow_threshold=self._pyarrow_threshold,
+                    executor=self._executor,
+                    collect_stats=self._column_stats,
+                    downcast_numbers=self._downcast_numbers
+                )
+                df_data = columns if self._lazy_data else columns.to_frame()
+            column_stats = None if self._lazy_data else columns.stats
+
+            if isinstance(df_data, DataFrame):
+                logger.debug('Received data:\n%s', df_data.head())
+            else:
+                logger.debug('Received data with columns %s', df_data.names)
         else:
             has_data = False
             df_data = None
+            column_stats = None
             logger.debug('Received request without data')
 
         # use the analytics extension server timezone as a default, assuming they usually
@@ -195,11 +292,57 @@ class CadenzaAnalyticsExtension:
             cadenza_timezone_current_offset=request.headers.get("X-Disy-Cadenza-Timezone-Current-Offset",
                                                                 default=analytics_extension_current_offset_formatted))
         if has_data:
-            analytics_request[self._table_name] = RequestTable(df_data, metadata)
+            analytics_request[self._table_name] = RequestTable(df_data, metadata, column_stats)
 
         return analytics_request
 
+    def _project_metadata(self, metadata_dict: dict) -> dict:
+        """Remove the columns that are not part of the projection from the metadata."""
+        read_groups = set(self._projection) | {AttributeGroup.ID_ATTRIBUTE_GROUP_NAME}
+        containers = metadata_dict.get('dataContainers')
+        if not containers:
+            return metadata_dict
+        columns = [column for column in containers[0]['columns']
+                   if column.get('attributeGroupName') in read_groups]
+        return {**metadata_dict, 'dataContainers': [{**containers[0], 'columns': columns}, *containers[1:]]}
+
     def _get_from_request(self, multipart_request, part_name: str) -> str:
         if part_name in multipart_request.form:
             return multipart_request.form[part_name]
         return multipart_request.files[part_name].read().decode('UTF-8')
+
+    @contextmanager
+    def _open_csv_source(self, multipart_request,
+                         part_name: str) -> Iterator[Union[str, mmap.mmap, BinaryIO]]:
+        if part_name in multipart_request.form:
+            yield multipart_request.form[part_name]
+            return
+
+        stream = multipart_request.files[part_name].stream
+        mapped_file = self._map_file(stream)
+        if mapped_file is None:
+            # the uploaded stream is parsed in chunks, it is neither read nor decoded as a whole
+            yield stream
+            return
+        try:
+            yield mapped_file
+        finally:
+            mapped_file.close()
+
+    @staticmethod
+    def _map_file(stream: BinaryIO) -> Optional[mmap.mmap]:
+        """Memory-map an upload that was spooled to a file, so that it is parsed without reading it first."""
+        # asking a spooled upload that is still held in memory for its file descriptor would write it to disk,
+        # it has no name until it is rolled over to a file
+        if isinstance(stream, tempfile.SpooledTemporaryFile) and stream.name is None:
+            return None
+        try:
+            fileno = stream.fileno()
+        except (io.UnsupportedOperation, OSError, AttributeError):
+            # an in-memory stream without a file descriptor
+            return None
+        try:
+            return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # e.g. an empty file which cannot be mapped
+            return None
@@ -9,6 +9,7 @@ from flask import Flask, Response
 from flask_cors import CORS
 
 from cadenzaanalytics.cadenza_analytics_extension import CadenzaAnalyticsExtension
+from cadenzaanalytics.data.dtype_backend import DtypeBackend
 from cadenzaanalytics.version import __version__
 
 
@@ -20,13 +21,20 @@ class CadenzaAnalyticsExtensionService:
     with `run_development_server()` or access the Flask app via the `app` property.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, dtype_backend: Optional[DtypeBackend] = None) -> None:
         """Initialize the CadenzaAnalyticsExtensionService.
 
         Creates a Flask application with CORS support and sets up the
         extension discovery endpoint at the root path.
+
+        Parameters
+        ----------
+        dtype_backend : Optional[DtypeBackend], optional
+            The dtypes the columns of the request data are parsed into for all added extensions
+            that do not set their own dtype backend, by default `DtypeBackend.NUMPY_NULLABLE`.
         """
         self._analytics_extensions = []
+        self._dtype_backend = dtype_backend
 
         self._app = Flask('cadenzaanalytics')
         CORS(self._app)
@@ -62,6 +70,9 @@ class CadenzaAnalyticsExtensionService:
 
         self._validate_analytics_function(analytics_extension._analytics_function)  # pylint: disable=W0212
 
+        if analytics_extension.dtype_backend is None:
+            analytics_extension.dtype_backend = self._dtype_backend
+
         self._analytics_extensions.append(analytics_extension)
 
         self._app.add_url_rule("/" + analytics_extension.relative_path,
@@ -59,3 +59,14 @@ class AttributeGroup(DataObject):
         self._requested_srs = requested_srs
         self._min_attributes = min_attributes
         self._max_attributes = max_attributes
+
+    @property
+    def name(self) -> str:
+        """Get the name of the attribute group.
+
+        Returns
+        -------
+        str
+            The internal name of the attribute group.
+        """
+        return self._name
@@ -4,6 +4,8 @@ from cadenzaanalytics.data.geometry_type import GeometryType
 from cadenzaanalytics.data.attribute_role import AttributeRole
 from cadenzaanalytics.data.data_object import DataObject
 from cadenzaanalytics.data.data_type import DataType
+from cadenzaanalytics.data.float_precision import FloatPrecision
+from cadenzaanalytics.data.geometry_precision import GeometryPrecision
 from cadenzaanalytics.data.measure_aggregation import MeasureAggregation
 
 
@@ -42,7 +44,9 @@ class ColumnMetadata(DataObject):
                  measure_aggregation: Optional[MeasureAggregation] = None,
                  format: Optional[str] = None,
                  geometry_type: Optional[GeometryType] = None,
-                 srs: Optional[str] = None) -> None:
+                 srs: Optional[str] = None,
+                 geometry_precision: Optional[GeometryPrecision] = None,
+                 float_precision: Optional[FloatPrecision] = None) -> None:
         """Initialize ColumnMetadata.
 
         Parameters
@@ -65,6 +69,12 @@ class ColumnMetadata(DataObject):
             Geometry type for geometry columns.
         srs : Optional[str], optional
             Spatial reference system for geometry columns.
+        geometry_precision : Optional[GeometryPrecision], optional
+            Precision of the WKT that the geometries of a response column are written as. It is not sent
+            to Cadenza. If None, the precision of the response applies.
+        float_precision : Optional[FloatPrecision], optional
+            Precision that the values of a FLOAT64 response column are written with. It is not sent to
+            Cadenza. If None, the precision of the response applies.
         """
         self._name = name
         self._print_name = print_name
@@ -75,6 +85,8 @@ class ColumnMetadata(DataObject):
         self._format = format
         self._geometry_type = geometry_type
         self._srs = srs
+        self._geometry_precision = geometry_precision
+        self._float_precision = float_precision
 
     @property
     def name(self) -> str:
@@ -177,3 +189,25 @@ class ColumnMetadata(DataObject):
             The SRS of the column, or None if not specified.
         """
         return self._srs
+
+    @property
+    def geometry_precision(self) -> Optional[GeometryPrecision]:
+        """Get the precision of the WKT that the geometries of the column are written as in a response.
+
+        Returns
+        -------
+        Optional[GeometryPrecision]
+            The precision of the column, or None if the precision of the response applies.
+        """
+        return self._geometry_precision
+
+    @property
+    def float_precision(self) -> Optional[FloatPrecision]:
+        """Get the precision that the values of the column are written with in a response.
+
+        Returns
+        -------
+        Optional[FloatPrecision]
+            The precision of the column, or None if the precision of the response applies.
+        """
+        return self._float_precision
@@ -0,0 +1,106 @@
+from typing import Any
+
+from cadenzaanalytics.data.data_object import DataObject
+
+
+class ColumnStats(DataObject):
+    """Statistics of the values of a column in request data.
+
+    Collected while the request data is parsed, so that extensions can validate or bin the data
+    without another pass over its values.
+    """
+    _attribute_mapping = {
+        "count": "_count",
+        "nullCount": "_null_count",
+        "distinctCount": "_distinct_count",
+        "min": "_min",
+        "max": "_max"
+    }
+
+    # pylint: disable=redefined-builtin
+    def __init__(self, *,
+                 count: int,
+                 null_count: int,
+                 distinct_count: int,
+                 min: Any = None,
+                 max: Any = None) -> None:
+        """Initialize ColumnStats.
+
+        Parameters
+        ----------
+        count : int
+            Number of rows, including missing values.
+        null_count : int
+            Number of missing values.
+        distinct_count : int
+            Approximate number of distinct values that are not missing.
+        min : Any, optional
+            Smallest value of a numeric or datetime column.
+        max : Any, optional
+            Largest value of a numeric or datetime column.
+        """
+        self._count = count
+        self._null_count = null_count
+        self._distinct_count = distinct_count
+        self._min = min
+        self._max = max
+
+    @property
+    def count(self) -> int:
+        """Get the number of rows of the column.
+
+        Returns
+        -------
+        int
+            The number of rows, including missing values.
+        """
+        return self._count
+
+    @property
+    def null_count(self) -> int:
+        """Get the number of missing values of the column.
+
+        Returns
+        -------
+        int
+            The number of missing values. NaN values of a Float64 column are not missing.
+        """
+        return self._null_count
+
+    @property
+    def distinct_count(self) -> int:
+        """Get the approximate number of distinct values of the column.
+
+        Up to 1024 distinct values are counted exactly, larger counts are estimated with an error
+        of typically about 3%.
+
+        Returns
+        -------
+        int
+            The approximate number of distinct values that are not missing.
+        """
+        return self._distinct_count
+
+    @property
+    def min(self) -> Any:
+        """Get the smallest value of a numeric or datetime column.
+
+        Returns
+        -------
+        Any
+            The smallest value that is not missing or NaN, None for other columns and columns
+            without such values.
+        """
+        return self._min
+
+    @property
+    def max(self) -> Any:
+        """Get the largest value of a numeric or datetime column.
+
+        Returns
+        -------
+        Any
+            The largest value that is not missing or NaN, None for other columns and columns
+            without such values.
+        """
+        return self._max
@@ -0,0 +1,24 @@
+from enum import Enum
+
+
+class DtypeBackend(Enum):
+    """Enumeration of the pandas dtypes that the columns of request data are parsed into.
+
+    NUMPY_NULLABLE
+        NumPy-backed nullable dtypes: `Int64`, `Float64`, `string` with Python object storage and
+        `datetime64[ns, UTC]`.
+    PYARROW
+        Arrow-backed dtypes: `int64[pyarrow]`, `double[pyarrow]`, `string[pyarrow]` and
+        `timestamp[us, tz=UTC][pyarrow]`. Requires the optional dependency pyarrow.
+    NUMPY
+        Plain NumPy dtypes: `float64` with NaN for missing values, `int64` for integer columns without
+        missing values, `object` for text and `datetime64[ns, UTC]`. Integer columns with missing values
+        fall back to `Int64`.
+    """
+
+    NUMPY_NULLABLE = "numpy_nullable"
+    PYARROW = "pyarrow"
+    NUMPY = "numpy"
+
+    def __str__(self) -> str:
+        return self.value
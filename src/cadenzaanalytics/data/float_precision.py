@@ -0,0 +1,72 @@
+from typing import Optional
+
+
+class FloatPrecision:
+    """Precision that the values of a FLOAT64 response column are written with.
+
+    By default, floats are written with the shortest representation that is read back as the same
+    value, e.g. 0.1 or 1e+16. With a fixed number of significant digits or decimals, measures whose
+    precision is limited anyway are written shorter and faster.
+    """
+
+    def __init__(self, *,
+                 significant_digits: Optional[int] = None,
+                 decimals: Optional[int] = None) -> None:
+        """Initialize FloatPrecision.
+
+        Parameters
+        ----------
+        significant_digits : Optional[int], optional
+            Number of significant digits the values are rounded to, formatted like `'%.<n>g'`:
+            trailing zeros are omitted and very small or large values are written with an exponent.
+        decimals : Optional[int], optional
+            Number of decimals the values are written with, formatted like `'%.<n>f'`.
+
+        Raises
+        ------
+        ValueError
+            If both significant_digits and decimals are given, or either is negative.
+        """
+        if significant_digits is not None and decimals is not None:
+            raise ValueError("Only one of significant_digits and decimals can be given.")
+        if (significant_digits or 0) < 0 or (decimals or 0) < 0:
+            raise ValueError("The number of significant digits or decimals must not be negative.")
+        self._significant_digits = significant_digits
+        self._decimals = decimals
+
+    @property
+    def significant_digits(self) -> Optional[int]:
+        """Get the number of significant digits the values are rounded to.
+
+        Returns
+        -------
+        Optional[int]
+            The number of significant digits, or None.
+        """
+        return self._significant_digits
+
+    @property
+    def decimals(self) -> Optional[int]:
+        """Get the number of decimals the values are written with.
+
+        Returns
+        -------
+        Optional[int]
+            The number of decimals, or None.
+        """
+        return self._decimals
+
+    @property
+    def pattern(self) -> Optional[str]:
+        """Get the printf-style pattern that the values are formatted with.
+
+        Returns
+        -------
+        Optional[str]
+            The pattern, or None for the shortest representation of the values.
+        """
+        if self._significant_digits is not None:
+            return f'%.{self._significant_digits}g'
+        if self._decimals is not None:
+            return f'%.{self._decimals}f'
+        return None
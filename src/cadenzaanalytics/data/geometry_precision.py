@@ -0,0 +1,63 @@
+from typing import Optional
+
+
+class GeometryPrecision:
+    """Precision of the WKT that the geometries of a response column are written as.
+
+    Fewer decimals make the response smaller and faster to write, which matters most for polygons
+    with many coordinates.
+    """
+
+    def __init__(self, *,
+                 rounding_precision: int = 6,
+                 trim: bool = True,
+                 grid_size: Optional[float] = None) -> None:
+        """Initialize GeometryPrecision.
+
+        Parameters
+        ----------
+        rounding_precision : int, optional
+            Number of decimals the coordinates are rounded to, by default 6 like `shapely.to_wkt`.
+            With -1, coordinates are written with all their significant digits.
+        trim : bool, optional
+            Whether trailing zeros of the decimals are omitted, by default True.
+        grid_size : Optional[float], optional
+            Size of a grid that the coordinates are snapped to with `shapely.set_precision` before they
+            are written, e.g. 0.01. Vertices that fall onto each other are removed.
+        """
+        self._rounding_precision = rounding_precision
+        self._trim = trim
+        self._grid_size = grid_size
+
+    @property
+    def rounding_precision(self) -> int:
+        """Get the number of decimals the coordinates are rounded to.
+
+        Returns
+        -------
+        int
+            The number of decimals, -1 for all significant digits.
+        """
+        return self._rounding_precision
+
+    @property
+    def trim(self) -> bool:
+        """Get whether trailing zeros of the decimals are omitted.
+
+        Returns
+        -------
+        bool
+            True if trailing zeros are omitted.
+        """
+        return self._trim
+
+    @property
+    def grid_size(self) -> Optional[float]:
+        """Get the size of the grid that the coordinates are snapped to.
+
+        Returns
+        -------
+        Optional[float]
+            The grid size, or None if the coordinates are not snapped.
+        """
+        return self._grid_size
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from cadenzaanalytics.data.attribute_group import AttributeGroup
 
@@ -8,7 +8,8 @@ class Table:
 
     def __init__(self, *,
                  name: str,
-                 attribute_groups: List[AttributeGroup]) -> None:
+                 attribute_groups: List[AttributeGroup],
+                 projection: Optional[List[str]] = None) -> None:
         """Initialize a Table.
 
         Parameters
@@ -17,9 +18,24 @@ class Table:
             The name of the table, used to reference it in the analytics request.
         attribute_groups : List[AttributeGroup]
             List of attribute groups defining the expected data structure.
+        projection : Optional[List[str]], optional
+            Names of the attribute groups whose columns the analytics function reads. Columns of
+            other attribute groups are not parsed and not part of the request table, except for
+            the ID columns. By default, all columns are read.
+
+        Raises
+        ------
+        ValueError
+            If the projection names an attribute group that is not part of the table.
         """
+        if projection is not None:
+            group_names = {attribute_group.name for attribute_group in attribute_groups}
+            unknown_names = [group_name for group_name in projection if group_name not in group_names]
+            if unknown_names:
+                raise ValueError(f'Projection contains unknown attribute groups {unknown_names}')
         self._name = name
         self._attribute_groups = attribute_groups
+        self._projection = projection
 
     @property
     def name(self) -> str:
@@ -42,3 +58,14 @@ class Table:
             The attribute groups defining the table structure.
         """
         return self._attribute_groups
+
+    @property
+    def projection(self) -> Optional[List[str]]:
+        """Get the names of the attribute groups whose columns are read.
+
+        Returns
+        -------
+        Optional[List[str]]
+            The names of the read attribute groups, or None if all columns are read.
+        """
+        return self._projection
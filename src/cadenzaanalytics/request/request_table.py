@@ -1,6 +1,12 @@
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
 from pandas import DataFrame
 
+from cadenzaanalytics.data.column_stats import ColumnStats
 from cadenzaanalytics.request.request_metadata import RequestMetadata
+from cadenzaanalytics.util.csv import CsvColumns
+from cadenzaanalytics.util.stats import frame_stats
 
 
 class RequestTable:
@@ -9,18 +15,29 @@ class RequestTable:
     Contains the actual data as a pandas DataFrame and metadata describing the columns.
     """
 
-    def __init__(self, data: DataFrame, metadata: RequestMetadata) -> None:
+    def __init__(self,
+                 data: Union[DataFrame, CsvColumns],
+                 metadata: RequestMetadata,
+                 stats: Optional[Dict[str, ColumnStats]] = None) -> None:
         """Initialize a RequestTable.
 
         Parameters
         ----------
-        data : DataFrame
-            The data payload as a pandas DataFrame.
+        data : Union[DataFrame, CsvColumns]
+            The data payload as a pandas DataFrame, or as parsed columns that are converted when first read.
         metadata : RequestMetadata
             Metadata describing the columns in the data.
+        stats : Optional[Dict[str, ColumnStats]], optional
+            Statistics of the columns, collected while the data was parsed.
         """
-        self._data = data
+        if isinstance(data, CsvColumns):
+            self._data = None
+            self._columns = data
+        else:
+            self._data = data
+            self._columns = None
         self._metadata = metadata
+        self._stats = stats
 
     @property
     def metadata(self) -> RequestMetadata:
@@ -37,9 +54,71 @@ class RequestTable:
     def data(self) -> DataFrame:
         """Get the data payload of the table.
 
+        If the table holds parsed columns that have not been converted yet, all of them are
+        converted on first access.
+
         Returns
         -------
         DataFrame
             The table data as a pandas DataFrame.
         """
+        if self._data is None:
+            self._data = self._columns.to_frame()
+            if self._stats is None:
+                # collected while the columns were converted, if at all
+                self._stats = self._columns.stats
+            self._columns = None
         return self._data
+
+    @property
+    def stats(self) -> Dict[str, ColumnStats]:
+        """Get statistics of the columns of the table.
+
+        The statistics are the row count, null count and approximate distinct count of each column,
+        as well as the min and max of numeric and datetime columns. If the extension collects column
+        statistics, they were collected while the request data was parsed, and columns of lazily
+        converted data are converted on first access. Otherwise, the statistics are computed from
+        `data` on first access.
+
+        Returns
+        -------
+        Dict[str, ColumnStats]
+            The statistics of the columns by their names in the metadata.
+        """
+        if self._stats is None:
+            if self._columns is not None:
+                self._stats = self._columns.stats
+            if self._stats is None:
+                self._stats = frame_stats(self.data)
+        return {name: self._stats[name] for name in self._metadata if name in self._stats}
+
+    def select(self, columns: List[str], *, copy: bool = True) -> DataFrame:
+        """Get the data of some columns of the table.
+
+        If the table holds parsed columns that have not been converted yet, only the selected
+        columns are converted. Other columns stay unconverted until they are selected or `data`
+        is accessed.
+
+        Parameters
+        ----------
+        columns : List[str]
+            The names of the columns in the order they should have in the result.
+        copy : bool, optional
+            Whether the result gets copies of the values, by default True. Without copies, the values
+            are shared with the table and must not be modified.
+
+        Returns
+        -------
+        DataFrame
+            A new DataFrame of the selected columns.
+
+        Raises
+        ------
+        KeyError
+            If a column does not exist.
+        """
+        if self._data is not None:
+            if copy or not columns:
+                return self._data[columns]
+            return pd.concat([self._data[column] for column in columns], axis=1, copy=False)
+        return self._columns.to_frame(columns, copy=copy)
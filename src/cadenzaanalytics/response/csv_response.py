@@ -1,3 +1,5 @@
+from concurrent.futures import Executor
+from itertools import chain
 from typing import List, Optional
 import logging
 
@@ -6,14 +8,18 @@ from pandas import DataFrame
 
 from cadenzaanalytics.data.column_metadata import ColumnMetadata
 from cadenzaanalytics.data.data_type import DataType
+from cadenzaanalytics.data.float_precision import FloatPrecision
+from cadenzaanalytics.data.geometry_precision import GeometryPrecision
 from cadenzaanalytics.request.request_table import RequestTable
 from cadenzaanalytics.response.extension_data_response import ExtensionDataResponse
 from cadenzaanalytics.response.missing_metadata_strategy import MissingMetadataStrategy
-from cadenzaanalytics.util import to_cadenza_csv
+from cadenzaanalytics.util import iter_cadenza_csv
+from cadenzaanalytics.util.writer import CHUNK_ROWS
 
 logger = logging.getLogger('cadenzaanalytics')
 
 
+# pylint: disable=too-many-instance-attributes
 class CsvResponse(ExtensionDataResponse):
     """Base class for CSV-based responses from an analytics extension.
 
@@ -24,7 +30,12 @@ class CsvResponse(ExtensionDataResponse):
                  data: DataFrame,
                  column_metadata: List[ColumnMetadata],
                  *,
-                 missing_metadata_strategy: MissingMetadataStrategy = MissingMetadataStrategy.ADD_DEFAULT_METADATA
+                 missing_metadata_strategy: MissingMetadataStrategy = MissingMetadataStrategy.ADD_DEFAULT_METADATA,
+                 geometry_precision: Optional[GeometryPrecision] = None,
+                 float_precision: Optional[FloatPrecision] = None,
+                 max_workers: int = 1,
+                 executor: Optional[Executor] = None,
+                 chunk_rows: int = CHUNK_ROWS
                  ) -> None:
         """Initialize a CsvResponse.
 
@@ -36,14 +47,34 @@ class CsvResponse(ExtensionDataResponse):
             Metadata describing the columns in the response.
         missing_metadata_strategy : MissingMetadataStrategy, optional
             Strategy for handling columns without metadata, by default ADD_DEFAULT_METADATA.
+        geometry_precision : Optional[GeometryPrecision], optional
+            Precision of the WKT of geometry columns whose metadata has no precision of its own,
+            by default shapely's precision of 6 decimals.
+        float_precision : Optional[FloatPrecision], optional
+            Precision of the values of FLOAT64 columns whose metadata has no precision of its own,
+            by default the shortest representation of the values.
+        max_workers : int, optional
+            Maximum number of chunks of the CSV data that are formatted in parallel, by default 1.
+            With more than one, chunks are formatted on a thread pool ahead of the chunk that is sent.
+        executor : Optional[Executor], optional
+            Executor on which the chunks of the CSV data are formatted, e.g. a ProcessPoolExecutor,
+            by default None for a thread pool of max_workers threads.
+        chunk_rows : int, optional
+            Number of rows per chunk of the CSV data, by default 10000.
         """
         content_type = 'text/csv'
         super().__init__(content_type)
-        # copy data to avoid side effects and allow safely extending data with missing id columns
-        self._data = data.copy()
+        # a shallow copy shares the values of the columns, but columns can be removed and missing id columns
+        # added without side effects on the data of the caller; with copy-on-write, it is a lazy copy
+        self._data = data.copy(deep=False)
         self._column_meta_data = list(column_metadata)
         self._is_runtime_validation_active = True
         self._missing_metadata_strategy = missing_metadata_strategy
+        self._geometry_precision = geometry_precision
+        self._float_precision = float_precision
+        self._max_workers = max_workers
+        self._executor = executor
+        self._chunk_rows = chunk_rows
 
 
     @property
@@ -89,6 +120,46 @@ class CsvResponse(ExtensionDataResponse):
         self._missing_metadata_strategy = value
 
 
+    @property
+    def geometry_precision(self) -> Optional[GeometryPrecision]:
+        """Getter for the precision of the WKT of geometry columns without a precision in their metadata.
+
+        Returns
+        -------
+        Optional[GeometryPrecision]
+            Current geometry precision, None for shapely's precision of 6 decimals
+        """
+
+        return self._geometry_precision
+
+
+    @geometry_precision.setter
+    def geometry_precision(self, value: Optional[GeometryPrecision]) -> None:
+        """Setter for the precision of the WKT of geometry columns without a precision in their metadata."""
+
+        self._geometry_precision = value
+
+
+    @property
+    def float_precision(self) -> Optional[FloatPrecision]:
+        """Getter for the precision of the values of FLOAT64 columns without a precision in their metadata.
+
+        Returns
+        -------
+        Optional[FloatPrecision]
+            Current float precision, None for the shortest representation of the values
+        """
+
+        return self._float_precision
+
+
+    @float_precision.setter
+    def float_precision(self, value: Optional[FloatPrecision]) -> None:
+        """Setter for the precision of the values of FLOAT64 columns without a precision in their metadata."""
+
+        self._float_precision = value
+
+
     def get_response(self, request_table: Optional[RequestTable] = None) -> Response:
         """Get the CSV response.
 
@@ -100,21 +171,33 @@ class CsvResponse(ExtensionDataResponse):
         Returns
         -------
         Response
-            Flask Response containing the CSV data.
+            Flask Response containing the CSV data, which is formatted in chunks while it is sent.
         """
         leftover_metadata_column_names = self._apply_missing_metadata_strategy()
         self._validate_response(leftover_metadata_column_names)
 
         datetime_columns = [c.name for c in self._column_meta_data if c.data_type == DataType.ZONEDDATETIME]
         geometry_columns = [c.name for c in self._column_meta_data if c.data_type == DataType.GEOMETRY]
+        geometry_precision = {c.name: c.geometry_precision or self._geometry_precision
+                              for c in self._column_meta_data if c.data_type == DataType.GEOMETRY}
+        float_precision = {c.name: c.float_precision or self._float_precision
+                           for c in self._column_meta_data if c.data_type == DataType.FLOAT64}
         float_columns = [c.name for c in self._column_meta_data if c.data_type == DataType.FLOAT64]
         int_columns = [c.name for c in self._column_meta_data if c.data_type == DataType.INT64]
-        csv_data = to_cadenza_csv(self._data,
+        chunks = iter_cadenza_csv(self._data,
                                   datetime_columns=datetime_columns,
                                   geometry_columns=geometry_columns,
                                   float_columns=float_columns,
-                                  int_columns=int_columns)
-        return self._create_response(csv_data, self._column_meta_data)
+                                  int_columns=int_columns,
+                                  geometry_precision=geometry_precision,
+                                  float_precision=float_precision,
+                                  chunk_rows=self._chunk_rows,
+                                  max_workers=self._max_workers,
+                                  executor=self._executor)
+        # the first chunk is formatted right away, so that values that cannot be written raise an error
+        # before the response is sent
+        first_chunk = next(chunks, b'')
+        return self._create_streamed_response(chain([first_chunk], chunks), self._column_meta_data)
 
 
     def _validate_response(self, leftover_metadata_column_names: List[str]) -> None:
@@ -190,7 +273,8 @@ class CsvResponse(ExtensionDataResponse):
                                 'Column has been removed from response. '
                                 'missing_metadata_strategy=%s', df_column_name, self._missing_metadata_strategy.name)
 
-                    self._data.drop(df_column_name, axis=1, inplace=True)
+                    # unlike drop(), del does not copy the values of the remaining columns
+                    del self._data[df_column_name]
                 else:
                     raise ValueError(f"Metadata definition for column \"{df_column_name}\" is missing.")
         return list(metadata_column_names.keys())
@@ -1,10 +1,14 @@
-from typing import List
+from concurrent.futures import Executor
+from typing import List, Optional
 
 from pandas import DataFrame
 
 from cadenzaanalytics.data.column_metadata import ColumnMetadata
+from cadenzaanalytics.data.float_precision import FloatPrecision
+from cadenzaanalytics.data.geometry_precision import GeometryPrecision
 from cadenzaanalytics.response.csv_response import CsvResponse
 from cadenzaanalytics.response.missing_metadata_strategy import MissingMetadataStrategy
+from cadenzaanalytics.util.writer import CHUNK_ROWS
 
 
 class DataResponse(CsvResponse):
@@ -18,7 +22,12 @@ class DataResponse(CsvResponse):
                  data: DataFrame,
                  column_metadata: List[ColumnMetadata],
                  *,
-                 missing_metadata_strategy: MissingMetadataStrategy = MissingMetadataStrategy.ADD_DEFAULT_METADATA
+                 missing_metadata_strategy: MissingMetadataStrategy = MissingMetadataStrategy.ADD_DEFAULT_METADATA,
+                 geometry_precision: Optional[GeometryPrecision] = None,
+                 float_precision: Optional[FloatPrecision] = None,
+                 max_workers: int = 1,
+                 executor: Optional[Executor] = None,
+                 chunk_rows: int = CHUNK_ROWS
                  ) -> None:
         """Initialize a DataResponse.
 
@@ -31,5 +40,24 @@ class DataResponse(CsvResponse):
         missing_metadata_strategy : MissingMetadataStrategy, optional
             Strategy for handling columns without metadata,
             by default ADD_DEFAULT_METADATA.
+        geometry_precision : Optional[GeometryPrecision], optional
+            Precision of the WKT of geometry columns whose metadata has no precision of its own,
+            by default shapely's precision of 6 decimals.
+        float_precision : Optional[FloatPrecision], optional
+            Precision of the values of FLOAT64 columns whose metadata has no precision of its own,
+            by default the shortest representation of the values.
+        max_workers : int, optional
+            Maximum number of chunks of the CSV data that are formatted in parallel, by default 1.
+            With more than one, chunks are formatted on a thread pool ahead of the chunk that is sent.
+        executor : Optional[Executor], optional
+            Executor on which the chunks of the CSV data are formatted, e.g. a ProcessPoolExecutor,
+            by default None for a thread pool of max_workers threads.
+        chunk_rows : int, optional
+            Number of rows per chunk of the CSV data, by default 10000.
         """
-        super().__init__(data, column_metadata, missing_metadata_strategy=missing_metadata_strategy)
+        super().__init__(data, column_metadata, missing_metadata_strategy=missing_metadata_strategy,
+                         geometry_precision=geometry_precision,
+                         float_precision=float_precision,
+                         max_workers=max_workers,
+                         executor=executor,
+                         chunk_rows=chunk_rows)
@@ -1,13 +1,18 @@
+from concurrent.futures import Executor
 from typing import List, Optional
 
+import pandas as pd
 from flask import Response
 from pandas import DataFrame
 
 from cadenzaanalytics.data.column_metadata import ColumnMetadata
+from cadenzaanalytics.data.float_precision import FloatPrecision
+from cadenzaanalytics.data.geometry_precision import GeometryPrecision
 from cadenzaanalytics.data.attribute_group import AttributeGroup
 from cadenzaanalytics.request.request_table import RequestTable
 from cadenzaanalytics.response.csv_response import CsvResponse
 from cadenzaanalytics.response.missing_metadata_strategy import MissingMetadataStrategy
+from cadenzaanalytics.util.writer import CHUNK_ROWS
 
 
 class EnrichmentResponse(CsvResponse):
@@ -22,7 +27,12 @@ class EnrichmentResponse(CsvResponse):
                  data: DataFrame,
                  column_metadata: List[ColumnMetadata],
                  *,
-                 missing_metadata_strategy: MissingMetadataStrategy = MissingMetadataStrategy.ADD_DEFAULT_METADATA
+                 missing_metadata_strategy: MissingMetadataStrategy = MissingMetadataStrategy.ADD_DEFAULT_METADATA,
+                 geometry_precision: Optional[GeometryPrecision] = None,
+                 float_precision: Optional[FloatPrecision] = None,
+                 max_workers: int = 1,
+                 executor: Optional[Executor] = None,
+                 chunk_rows: int = CHUNK_ROWS
                  ) -> None:
         """Initialize an EnrichmentResponse.
 
@@ -36,10 +46,29 @@ class EnrichmentResponse(CsvResponse):
             Strategy to handle missing metadata, by default ADD_DEFAULT_METADATA.
             REMOVE_DATA_COLUMNS removes non-id columns without metadata.
             ADD_DEFAULT_METADATA generates default metadata for columns without explicit metadata.
+        geometry_precision : Optional[GeometryPrecision], optional
+            Precision of the WKT of geometry columns whose metadata has no precision of its own,
+            by default shapely's precision of 6 decimals.
+        float_precision : Optional[FloatPrecision], optional
+            Precision of the values of FLOAT64 columns whose metadata has no precision of its own,
+            by default the shortest representation of the values.
+        max_workers : int, optional
+            Maximum number of chunks of the CSV data that are formatted in parallel, by default 1.
+            With more than one, chunks are formatted on a thread pool ahead of the chunk that is sent.
+        executor : Optional[Executor], optional
+            Executor on which the chunks of the CSV data are formatted, e.g. a ProcessPoolExecutor,
+            by default None for a thread pool of max_workers threads.
+        chunk_rows : int, optional
+            Number of rows per chunk of the CSV data, by default 10000.
         """
         super().__init__(data,
                          column_metadata=column_metadata,
-                         missing_metadata_strategy=missing_metadata_strategy)
+                         missing_metadata_strategy=missing_metadata_strategy,
+                         geometry_precision=geometry_precision,
+                         float_precision=float_precision,
+                         max_workers=max_workers,
+                         executor=executor,
+                         chunk_rows=chunk_rows)
 
     def get_response(self, request_table: Optional[RequestTable] = None) -> Response:
         """Get the enrichment response.
@@ -97,10 +126,16 @@ class EnrichmentResponse(CsvResponse):
             # none are defined, we always add them from the request metadata
             self._column_meta_data.extend(request_table.metadata.ids)
         columns_in_data = set(self._data.columns)
-        for id_column in expected_id_names:
-            if id_column not in columns_in_data:
+        missing_id_names = [id_column for id_column in expected_id_names if id_column not in columns_in_data]
+        ids = request_table.select(missing_id_names, copy=False) if missing_id_names else None
+        if ids is not None and ids.index.equals(self._data.index):
+            # the rows align with those of the request, so that the id values of the request are
+            # shared as they are instead of being aligned and copied into the response
+            self._data = pd.concat([self._data, ids], axis=1, copy=False)
+        elif ids is not None:
+            for id_column in missing_id_names:
                 # Assumes column length matches one by one as only such kind of enrichment responses
                 # are expected or supported, else this will throw an ValueError.
                 # Changes in row order cannot be detected or managed here.
-                self._data.loc[:, id_column] = request_table.data[id_column]
+                self._data.loc[:, id_column] = ids[id_column]
         # now we know that the result has the expected ids and that there is corresponding result data
@@ -1,8 +1,8 @@
 import json
-from typing import List, Optional, Union
+import uuid
+from typing import Iterable, Iterator, List, Optional, Union
 
 from flask import Response
-from requests_toolbelt import MultipartEncoder
 
 from cadenzaanalytics.data.column_metadata import ColumnMetadata
 from cadenzaanalytics.data.data_container_metadata import DataContainerMetadata
@@ -43,9 +43,32 @@ class ExtensionDataResponse(ExtensionResponse):
 
     def _create_response(self, data: Union[str, bytes],
                          column_metadata: Optional[List[ColumnMetadata]] = None) -> Response:
-        multipart_response = MultipartEncoder(
-            {'metadata': (None, self._get_response_metadata(column_metadata), 'application/json'),
-             self._data_container_name: (None, data, self._content_type)}
-        )
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        boundary = uuid.uuid4().hex
+        # the parts are sent one after the other, the data is not copied into a single body
+        return Response(list(self._iter_multipart(boundary, [data], column_metadata)),
+                        mimetype=f'multipart/form-data; boundary={boundary}')
 
-        return Response(multipart_response.to_string(), mimetype=multipart_response.content_type)
+    def _create_streamed_response(self, chunks: Iterable[bytes],
+                                  column_metadata: Optional[List[ColumnMetadata]] = None) -> Response:
+        """Create a multipart response like `_create_response` whose data is streamed from chunks of bytes.
+
+        The chunks are read while the response is sent, so that the data is never held as a whole.
+        """
+        boundary = uuid.uuid4().hex
+        return Response(self._iter_multipart(boundary, chunks, column_metadata),
+                        mimetype=f'multipart/form-data; boundary={boundary}')
+
+    def _iter_multipart(self, boundary: str, chunks: Iterable[bytes],
+                        column_metadata: Optional[List[ColumnMetadata]]) -> Iterator[bytes]:
+        """Generate the multipart body of the metadata and the data, in the layout of `MultipartEncoder`."""
+        yield (f'--{boundary}\r\n'
+               f'Content-Disposition: form-data; name="metadata"\r\n'
+               f'Content-Type: application/json\r\n\r\n'
+               f'{self._get_response_metadata(column_metadata)}\r\n'
+               f'--{boundary}\r\n'
+               f'Content-Disposition: form-data; name="{self._data_container_name}"\r\n'
+               f'Content-Type: {self._content_type}\r\n\r\n').encode('utf-8')
+        yield from chunks
+        yield f'\r\n--{boundary}--\r\n'.encode('utf-8')
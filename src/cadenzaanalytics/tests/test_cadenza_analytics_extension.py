@@ -0,0 +1,334 @@
+"""Unit tests for request handling of CadenzaAnalyticsExtension."""
+import io
+import json
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask, request
+from requests_toolbelt import MultipartEncoder
+from requests_toolbelt.multipart.decoder import MultipartDecoder
+from shapely.geometry import Point
+
+import cadenzaanalytics as ca
+
+
+def _metadata(columns):
+    return json.dumps({
+        "dataContainers": [{"columns": columns}],
+        "parameters": []
+    })
+
+
+def _column(name, data_type, attribute_group_name="data", role="dimension"):
+    return {
+        "name": name,
+        "printName": name,
+        "attributeGroupName": attribute_group_name,
+        "dataType": data_type,
+        "role": role
+    }
+
+
+COLUMNS = [
+    _column("id", "int64", ca.AttributeGroup.ID_ATTRIBUTE_GROUP_NAME),
+    _column("name", "string"),
+    _column("value", "float64", role="measure"),
+    _column("timestamp", "zonedDateTime"),
+]
+
+CSV_DATA = (
+    '"id";"name";"value";"timestamp"\r\n'
+    '"1";"Alice";"1.5";"2023-01-03T15:29:13Z"\r\n'
+    '"2";"multi\r\nline";;\r\n'
+    '"3";;"NaN";"2023-06-15T10:00:00+01:00"\r\n'
+)
+
+
+class TestCadenzaAnalyticsExtensionRequest:
+    """Test suite for parsing analytics requests."""
+
+    @staticmethod
+    def _parse(extension, data, as_file=True, columns=None):
+        app = Flask(__name__)
+        payload = {"metadata": _metadata(columns or COLUMNS)}
+        if as_file:
+            payload["data"] = (io.BytesIO(data.encode("UTF-8")), "data.csv", "text/csv")
+        else:
+            payload["data"] = data
+        with app.test_request_context("/", method="POST", data=payload, content_type="multipart/form-data"):
+            return extension._get_request_data(request)  # pylint: disable=protected-access
+
+    @staticmethod
+    def _extension(**kwargs):
+        return ca.CadenzaAnalyticsExtension(
+            relative_path="test",
+            analytics_function=lambda request: None,
+            print_name="Test",
+            extension_type=ca.ExtensionType.ENRICHMENT,
+            tables=[ca.Table(name="table", attribute_groups=[])],
+            **kwargs
+        )
+
+    @pytest.mark.parametrize("as_file", [True, False])
+    def test_data_part_is_parsed(self, as_file):
+        """The data part is parsed with the column types of the metadata, from a file or a form field."""
+        analytics_request = self._parse(self._extension(), CSV_DATA, as_file=as_file)
+        data = analytics_request["table"].data
+
+        assert list(data.columns) == ["id", "name", "value", "timestamp"]
+        assert data["id"].dtype == "Int64"
+        assert data["value"].dtype == "Float64"
+        assert data["name"].iloc[0] == "Alice"
+        assert data["name"].iloc[1] == "multi\r\nline"
+        assert pd.isna(data["name"].iloc[2])
+        assert data["value"].iloc[0] == 1.5
+        assert pd.isna(data["value"].iloc[1])
+        assert data["timestamp"].iloc[0] == pd.Timestamp("2023-01-03T15:29:13Z")
+        assert data["timestamp"].iloc[2] == pd.Timestamp("2023-06-15T09:00:00Z")
+
+    def test_metadata_is_available(self):
+        """The request table holds the metadata of the request."""
+        analytics_request = self._parse(self._extension(), CSV_DATA)
+        assert analytics_request["table"].metadata.id_names == ["id"]
+
+    def test_large_upload_is_parsed(self):
+        """Uploads that are spooled to a temporary file are parsed like small ones."""
+        rows = "".join(f'"{i}";"name {i}";"{i}.5";"2023-01-03T15:29:13Z"\r\n' for i in range(4, 20000))
+        analytics_request = self._parse(self._extension(), CSV_DATA + rows)
+        data = analytics_request["table"].data
+
+        assert len(data) == 19999
+        assert data["id"].iloc[-1] == 19999
+        assert data["name"].iloc[1] == "multi\r\nline"
+        assert data["value"].iloc[-1] == 19999.5
+
+    def test_only_uploads_in_files_are_mapped(self):
+        """Uploads spooled to a file are memory-mapped, uploads held in memory are neither mapped nor written."""
+        map_file = ca.CadenzaAnalyticsExtension._map_file  # pylint: disable=protected-access
+        with tempfile.SpooledTemporaryFile(max_size=16) as spooled:
+            spooled.write(b'"a"\r\n')
+            assert map_file(spooled) is None
+            assert spooled.name is None
+            spooled.write(b'"1"\r\n' * 10)
+            with map_file(spooled) as mapped_file:
+                assert mapped_file[:5] == b'"a"\r\n'
+        assert map_file(io.BytesIO(b'"a"\r\n')) is None
+
+    def test_lazy_data_converts_selected_columns(self):
+        """With lazy data, columns are converted when selected and all of them when data is accessed."""
+        table = self._parse(self._extension(lazy_data=True), CSV_DATA)["table"]
+
+        selected = table.select(["timestamp", "id"])
+        assert list(selected.columns) == ["timestamp", "id"]
+        assert selected["timestamp"].iloc[0] == pd.Timestamp("2023-01-03T15:29:13Z")
+
+        eager = self._parse(self._extension(), CSV_DATA)["table"]
+        pd.testing.assert_frame_equal(table.data, eager.data)
+        pd.testing.assert_frame_equal(table.select(["name"]), eager.select(["name"]))
+
+    def test_enrichment_response_adds_ids_of_lazy_data(self):
+        """Enrichment responses take missing id columns from lazily converted request data."""
+        table = self._parse(self._extension(lazy_data=True), CSV_DATA)["table"]
+        df = pd.DataFrame({"result": [1.0, 2.0, 3.0]})
+        response = ca.EnrichmentResponse(df, [
+            ca.ColumnMetadata(name="result", print_name="Result", data_type=ca.DataType.FLOAT64,
+                              role=ca.AttributeRole.MEASURE, attribute_group_name="result")
+        ])
+        response._validate_ids(table)  # pylint: disable=protected-access
+        assert list(response._data["id"]) == [1, 2, 3]  # pylint: disable=protected-access
+        assert list(df.columns) == ["result"]
+
+    @pytest.mark.parametrize("lazy_data", [False, True])
+    def test_enrichment_response_shares_ids_of_aligned_rows(self, lazy_data):
+        """Id columns of responses whose rows align with the request share the id values of the request."""
+        table = self._parse(self._extension(lazy_data=lazy_data), CSV_DATA)["table"]
+        metadata = [ca.ColumnMetadata(name="result", print_name="Result", data_type=ca.DataType.FLOAT64,
+                                      role=ca.AttributeRole.MEASURE, attribute_group_name="result")]
+        response = ca.EnrichmentResponse(pd.DataFrame({"result": [1.0, 2.0, 3.0]}), metadata)
+        flask_response = response.get_response(table)
+        decoder = MultipartDecoder(flask_response.get_data(), flask_response.content_type)
+        assert decoder.parts[1].content == b'"result";"id"\r\n"1.0";"1"\r\n"2.0";"2"\r\n"3.0";"3"\r\n'
+        ids = response._data["id"].array  # pylint: disable=protected-access
+        assert np.shares_memory(ids._data, table.select(["id"], copy=False)["id"].array._data)  # pylint: disable=protected-access
+
+        # rows that do not align are matched by their index
+        response = ca.EnrichmentResponse(pd.DataFrame({"result": [3.0, 1.0]}, index=[2, 0]), metadata)
+        response._validate_ids(table)  # pylint: disable=protected-access
+        assert list(response._data["id"]) == [3, 1]  # pylint: disable=protected-access
+
+    def test_projection_skips_other_attribute_groups(self):
+        """Only the columns of projected attribute groups and the id columns are part of the request table."""
+        columns = COLUMNS + [_column("extra", "string", "other")]
+        data = (
+            '"id";"name";"value";"timestamp";"extra"\r\n'
+            '"1";"Alice";"1.5";"2023-01-03T15:29:13Z";"e"\r\n'
+            '"2";"multi\r\nline";;;"e"\r\n'
+            '"3";;"NaN";"invalid";"e"\r\n'
+        )
+        table = ca.Table(name="table", projection=["other"], attribute_groups=[
+            ca.AttributeGroup(name="data", print_name="Data", data_types=[ca.DataType.STRING]),
+            ca.AttributeGroup(name="other", print_name="Other", data_types=[ca.DataType.STRING]),
+        ])
+        extension = ca.CadenzaAnalyticsExtension(
+            relative_path="test",
+            analytics_function=lambda request: None,
+            print_name="Test",
+            extension_type=ca.ExtensionType.ENRICHMENT,
+            tables=[table])
+        request_table = self._parse(extension, data, columns=columns)["table"]
+
+        assert list(request_table.data.columns) == ["id", "extra"]
+        assert list(request_table.data["extra"]) == ["e", "e", "e"]
+        assert list(request_table.metadata) == ["id", "extra"]
+        assert request_table.metadata.id_names == ["id"]
+
+    def test_projection_of_unknown_attribute_group(self):
+        """A projection may only name attribute groups of the table."""
+        with pytest.raises(ValueError):
+            ca.Table(name="table", projection=["unknown"], attribute_groups=[
+                ca.AttributeGroup(name="data", print_name="Data", data_types=[ca.DataType.STRING])])
+
+    def test_categorical_dimensions(self):
+        """Text dimensions are parsed as categorical if enabled."""
+        table = self._parse(self._extension(categorical_dimensions=True), CSV_DATA)["table"]
+        assert isinstance(table.data["name"].dtype, pd.CategoricalDtype)
+        assert table.data["id"].dtype == "Int64"
+        assert table.data["value"].dtype == "Float64"
+        assert pd.isna(table.data["name"].iloc[2])
+
+    def test_pyarrow_dtype_backend(self):
+        """The dtype backend of an extension applies to its request data."""
+        pa = pytest.importorskip("pyarrow")
+        table = self._parse(self._extension(dtype_backend=ca.DtypeBackend.PYARROW), CSV_DATA)["table"]
+        assert table.data["id"].dtype == pd.ArrowDtype(pa.int64())
+        assert table.data["value"].dtype == pd.ArrowDtype(pa.float64())
+        assert table.data["name"].dtype == pd.StringDtype("pyarrow")
+        assert table.data["timestamp"].dtype == pd.ArrowDtype(pa.timestamp("us", tz="UTC"))
+
+    def test_numpy_dtype_backend(self):
+        """With the NumPy dtype backend, request data is parsed into plain NumPy columns."""
+        table = self._parse(self._extension(dtype_backend=ca.DtypeBackend.NUMPY), CSV_DATA)["table"]
+        assert table.data["id"].dtype == "int64"
+        assert table.data["value"].dtype == "float64"
+        assert table.data["name"].dtype == object
+        assert table.data["value"].isna().tolist() == [False, True, True]
+        assert table.data["name"].iloc[2] is None
+
+    def test_service_dtype_backend_is_default_of_extensions(self):
+        """The dtype backend of the service applies to extensions without their own dtype backend."""
+        service = ca.CadenzaAnalyticsExtensionService(dtype_backend=ca.DtypeBackend.PYARROW)
+        extension = self._extension()
+        own = ca.CadenzaAnalyticsExtension(relative_path="own", analytics_function=lambda request: None,
+                                           print_name="Own", extension_type=ca.ExtensionType.DATA,
+                                           dtype_backend=ca.DtypeBackend.NUMPY_NULLABLE)
+        service.add_analytics_extension(extension)
+        service.add_analytics_extension(own)
+        assert extension.dtype_backend == ca.DtypeBackend.PYARROW
+        assert own.dtype_backend == ca.DtypeBackend.NUMPY_NULLABLE
+
+    def test_pyarrow_reader(self):
+        """Request data above the threshold of the extension is read by pyarrow into the same columns."""
+        pytest.importorskip("pyarrow")
+        table = self._parse(self._extension(pyarrow_threshold=0), CSV_DATA)["table"]
+        expected = self._parse(self._extension(pyarrow_threshold=None), CSV_DATA)["table"]
+        pd.testing.assert_frame_equal(table.data, expected.data)
+
+    @pytest.mark.parametrize("lazy_data", [False, True])
+    def test_column_stats(self, monkeypatch, lazy_data):
+        """Column statistics are collected while parsing if enabled, and computed from the data otherwise."""
+        table = self._parse(self._extension(column_stats=True, lazy_data=lazy_data), CSV_DATA)["table"]
+        computed = self._parse(self._extension(), CSV_DATA)["table"].stats
+        monkeypatch.setattr("cadenzaanalytics.request.request_table.frame_stats", None)
+        stats = table.stats
+
+        assert list(stats) == ["id", "name", "value", "timestamp"]
+        assert {name: str(column) for name, column in stats.items()} == {
+            name: str(column) for name, column in computed.items()}
+        assert (stats["id"].count, stats["id"].null_count, stats["id"].min, stats["id"].max) == (3, 0, 1, 3)
+        assert (stats["name"].null_count, stats["name"].distinct_count) == (1, 2)
+        assert (stats["value"].null_count, stats["value"].distinct_count, stats["value"].max) == (1, 2, 1.5)
+        assert stats["timestamp"].max == pd.Timestamp("2023-06-15T09:00:00Z")
+
+    def test_downcast_numbers(self):
+        """Numeric columns of the request data are downcast if enabled."""
+        table = self._parse(self._extension(downcast_numbers=True), CSV_DATA)["table"]
+        assert table.data["id"].dtype == "int8"
+        assert table.data["value"].dtype == "Float32"
+        assert table.data["value"].iloc[0] == 1.5
+
+
+class TestCadenzaAnalyticsExtensionResponse:
+    """Test suite for the responses of analytics extensions."""
+
+    @staticmethod
+    def _metadata(name, data_type):
+        return ca.ColumnMetadata(name=name, print_name=name, data_type=data_type, role=ca.AttributeRole.MEASURE)
+
+    def test_csv_response_is_streamed(self):
+        """The CSV data of a data response is streamed in a multipart body with the metadata."""
+        df = pd.DataFrame({"value": [1.5, None] * 15000, "name": ["a;b", None] * 15000})
+        response = ca.DataResponse(df, [self._metadata("value", ca.DataType.FLOAT64),
+                                        self._metadata("name", ca.DataType.STRING)]).get_response()
+        assert response.is_streamed
+
+        decoder = MultipartDecoder(response.get_data(), response.content_type)
+        metadata, data = decoder.parts
+        assert metadata.headers[b"Content-Disposition"] == b'form-data; name="metadata"'
+        assert json.loads(metadata.text)["dataContainers"][0]["name"] == "response-data"
+        assert data.headers[b"Content-Type"] == b"text/csv"
+        assert data.content == ca.util.to_cadenza_csv(df, float_columns=["value"]).encode("UTF-8")
+
+    def test_csv_response_fails_before_it_is_sent(self):
+        """Values that cannot be written raise an error when the response is created."""
+        df = pd.DataFrame({"count": [1.0, float("inf")]})
+        response = ca.DataResponse(df, [self._metadata("count", ca.DataType.INT64)])
+        with pytest.raises(OverflowError):
+            response.get_response()
+
+    def test_geometry_precision(self):
+        """The geometry precision of column metadata takes precedence over that of the response."""
+        df = pd.DataFrame({"a": [Point(1.23456, 2)], "b": [Point(1.23456, 2)]})
+        metadata = [ca.ColumnMetadata(name="a", print_name="a", data_type=ca.DataType.GEOMETRY,
+                                      geometry_precision=ca.GeometryPrecision(rounding_precision=1)),
+                    ca.ColumnMetadata(name="b", print_name="b", data_type=ca.DataType.GEOMETRY)]
+        response = ca.DataResponse(df, metadata,
+                                   geometry_precision=ca.GeometryPrecision(rounding_precision=3)).get_response()
+        decoder = MultipartDecoder(response.get_data(), response.content_type)
+        assert decoder.parts[1].content == b'"a";"b"\r\n"POINT (1.2 2)";"POINT (1.235 2)"\r\n'
+        assert "geometryPrecision" not in decoder.parts[0].text
+
+    def test_float_precision(self):
+        """The float precision of column metadata takes precedence over that of the response."""
+        df = pd.DataFrame({"a": [1.23456, None], "b": [1.23456, None], "c": [1.5, None]})
+        metadata = [ca.ColumnMetadata(name="a", print_name="a", data_type=ca.DataType.FLOAT64,
+                                      float_precision=ca.FloatPrecision(decimals=1)),
+                    self._metadata("b", ca.DataType.FLOAT64), self._metadata("c", ca.DataType.STRING)]
+        response = ca.DataResponse(df, metadata,
+                                   float_precision=ca.FloatPrecision(significant_digits=3)).get_response()
+        decoder = MultipartDecoder(response.get_data(), response.content_type)
+        assert decoder.parts[1].content == b'"a";"b";"c"\r\n"1.2";"1.23";"1.5"\r\n"NaN";"NaN";\r\n'
+
+    def test_text_response_has_layout_of_multipart_encoder(self):
+        """The multipart body of other responses is sent in parts, with the layout of MultipartEncoder."""
+        text_response = ca.TextResponse("Grüße")
+        response = text_response.get_response()
+        assert not response.is_streamed
+        metadata = text_response._get_response_metadata(None)  # pylint: disable=protected-access
+        encoder = MultipartEncoder({"metadata": (None, metadata, "application/json"),
+                                    "response-data": (None, "Grüße", "text/plain;charset=utf-8")},
+                                   boundary=response.content_type.split("boundary=")[1])
+        assert response.content_type == encoder.content_type
+        assert response.get_data() == encoder.to_string()
+
+    def test_response_data_is_not_copied(self):
+        """Responses share the values of the data, but removing or adding columns does not change it."""
+        df = pd.DataFrame({"value": [1.5, 2.5, 3.5], "other": ["a", "b", "c"]})
+        response = ca.DataResponse(df, [self._metadata("value", ca.DataType.FLOAT64)],
+                                   missing_metadata_strategy=ca.MissingMetadataStrategy.REMOVE_DATA_COLUMNS)
+        response.get_response()
+        data = response._data  # pylint: disable=protected-access
+        assert list(data.columns) == ["value"]
+        assert np.shares_memory(data["value"].to_numpy(), df["value"].to_numpy())
+        assert list(df.columns) == ["value", "other"]
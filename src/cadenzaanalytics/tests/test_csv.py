@@ -1,8 +1,18 @@
 """Unit tests for Cadenza CSV parser."""
+import gc
+import io
+import mmap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
 from shapely.geometry import Point, LineString, MultiPoint, Polygon
+import numpy as np
 import pandas as pd
 import pytest
-from cadenzaanalytics.util.csv import from_cadenza_csv
+from cadenzaanalytics.data.dtype_backend import DtypeBackend
+from cadenzaanalytics.util import csv as csv_module, records
+from cadenzaanalytics.util.csv import from_cadenza_csv, parse_cadenza_csv, _parse_csv
 
 
 # pylint: disable=too-many-public-methods
@@ -536,6 +546,415 @@ class TestCadenzaCsvParser:
         assert result.iloc[2, 5] == Point(30, 40)
         assert result.iloc[2, 6] is None
 
+    def test_special_values_between_simple_rows(self):
+        """Rows with quoted semicolons, quotes or line breaks between simple rows."""
+        csv = (
+            '"a";"b"\r\n'
+            '"1";"x"\r\n'
+            '"2";"y;z"\r\n'
+            '"3";\r\n'
+            '"4";"say ""hi"""\r\n'
+            '"5";"multi\r\nline"\r\n'
+            ';"6"\r\n'
+        )
+        result = from_cadenza_csv(csv)
+        assert list(result["a"]) == ["1", "2", "3", "4", "5", None]
+        assert list(result["b"]) == ["x", "y;z", None, 'say "hi"', "multi\r\nline", "6"]
+
+    def test_quoted_line_that_looks_like_a_record(self):
+        """Lines inside a multi-line quoted value are not parsed as records of their own."""
+        csv = '"a";"b"\r\n"1";"first\r\n""x"";""y""\r\nlast"\r\n"2";"z"'
+        result = from_cadenza_csv(csv)
+        assert list(result["a"]) == ["1", "2"]
+        assert list(result["b"]) == ['first\r\n"x";"y"\r\nlast', "z"]
+
+    def test_unterminated_quoted_value(self):
+        """A missing closing quote consumes the rest of the data."""
+        assert _parse_csv('"a";"b"\r\n"1";"open\r\n2;3\r\n') == [["a", "b"], ["1", "open\r\n2;3\r\n"]]
+
+    def test_value_after_closing_quote(self):
+        """Characters directly following a closing quote start a new unquoted value."""
+        assert _parse_csv('"a"x;"b"\r\n') == [["a", None, "b"]]
+
+    def test_rows_across_block_boundaries(self, monkeypatch):
+        """Parsing in small blocks yields the same result, also for values spanning blocks."""
+        csv = '"a";"b"\r\n"1";"x"\r\n"2";"multi\r\nline\r\nvalue"\r\n;"y;z"\r\n"4";\r\n'
+        expected = from_cadenza_csv(csv, type_mapping={"a": "Int64"})
+        monkeypatch.setattr(csv_module, "_BLOCK_SIZE", 1)
+        monkeypatch.setattr(csv_module, "_BLOCK_ROWS", 1)
+        result = from_cadenza_csv(csv, type_mapping={"a": "Int64"})
+        pd.testing.assert_frame_equal(result, expected)
+        assert list(result["b"]) == ["x", "multi\r\nline\r\nvalue", "y;z", None]
+
+    def test_short_rows_are_filled_with_none(self):
+        """Rows with fewer values than headers are filled up with missing values."""
+        csv = '"a";"b"\r\n"1";"2"\r\n"3"\r\n'
+        result = from_cadenza_csv(csv)
+        assert result.iloc[1, 0] == "3"
+        assert result.iloc[1, 1] is None
+
+    def test_row_with_more_values_than_headers(self):
+        """Rows with more values than headers are rejected."""
+        csv = '"a";"b"\r\n"1";"2";"3"\r\n'
+        with pytest.raises(ValueError):
+            from_cadenza_csv(csv)
+
+    def test_garbage_collector_state_is_restored(self):
+        """The garbage collector is paused during parsing only."""
+        csv = '"number"\r\n"abc"'
+        assert gc.isenabled()
+        with pytest.raises(ValueError):
+            from_cadenza_csv(csv, type_mapping={"number": "Int64"})
+        assert gc.isenabled()
+
+    @pytest.mark.parametrize("block_size", [1, 2, 3, 5, 1 << 20])
+    def test_binary_stream(self, monkeypatch, block_size):
+        """A binary stream is parsed in chunks with the same result as the decoded string."""
+        csv = (
+            '"id";"text";"value"\r\n'
+            '"1";"Hello 世界";"1.5"\r\n'
+            '"2";"line1\r\nline2";\r\n'
+            ';"say ""hi"" 😀";"a;b"\r\n'
+            '"4";"";\r\n'
+        )
+        expected = from_cadenza_csv(csv, type_mapping={"id": "Int64"})
+        monkeypatch.setattr(csv_module, "_BLOCK_SIZE", block_size)
+        result = from_cadenza_csv(io.BytesIO(csv.encode("UTF-8")), type_mapping={"id": "Int64"})
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_binary_stream_is_not_closed(self):
+        """The stream stays open after parsing."""
+        stream = io.BytesIO('"a"\r\n"1"\r\n'.encode("UTF-8"))
+        from_cadenza_csv(stream)
+        assert not stream.closed
+
+    @pytest.mark.parametrize("data", [b"", b"  \r\n "])
+    def test_blank_binary_stream(self, data):
+        """Blank streams result in an empty DataFrame like blank strings."""
+        result = from_cadenza_csv(io.BytesIO(data))
+        assert result.empty
+        assert len(result.columns) == 0
+
+    @pytest.mark.parametrize("buffer_type", [bytes, bytearray, memoryview])
+    @pytest.mark.parametrize("block_size", [1, 3, 1 << 20])
+    def test_binary_buffer(self, monkeypatch, buffer_type, block_size):
+        """Bytes-like objects are tokenized without decoding them first."""
+        csv = (
+            '"id";"text";"value";"time";"geometry"\r\n'
+            '"1";"Hello 世界";"1.5";"2023-01-03T15:29:13Z";"POINT (1 2)"\r\n'
+            '"2";"line1\r\nline2";;;\r\n'
+            ';"say ""hi"" 😀";"NaN";"2023-06-15T10:00:00+01:00";"POINT (3 4)"\r\n'
+        )
+        kwargs = {
+            "type_mapping": {"id": "Int64", "text": "string", "value": "Float64"},
+            "datetime_columns": ["time"],
+            "geometry_columns": ["geometry"],
+        }
+        expected = from_cadenza_csv(csv, **kwargs)
+        monkeypatch.setattr(csv_module, "_BLOCK_SIZE", block_size)
+        result = from_cadenza_csv(buffer_type(csv.encode("UTF-8")), **kwargs)
+        pd.testing.assert_frame_equal(result, expected)
+        assert np.isnan(result["value"].iloc[2])
+
+    def test_memory_mapped_file(self, tmp_path):
+        """A memory-mapped file is parsed like the bytes it holds."""
+        csv = '"a";"b"\r\n"1";"x"\r\n;"y"\r\n'
+        path = tmp_path / "data.csv"
+        path.write_bytes(csv.encode("UTF-8"))
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            result = from_cadenza_csv(mapped, type_mapping={"a": "Int64"})
+        pd.testing.assert_frame_equal(result, from_cadenza_csv(csv, type_mapping={"a": "Int64"}))
+
+    @pytest.mark.parametrize("dtype", ["Int64", "Float64"])
+    def test_invalid_number_in_binary_data(self, dtype):
+        """Invalid numbers are rejected for binary data as for strings."""
+        with pytest.raises((ValueError, TypeError)):
+            from_cadenza_csv(b'"number"\r\n"1"\r\n"abc"\r\n', type_mapping={"number": dtype})
+
+    def test_parse_csv_binary_tokens(self):
+        """Binary data is split into UTF-8 encoded values."""
+        rows = _parse_csv('"ä";;"a""b"\r\n"x;y"\r\n'.encode("UTF-8"))
+        assert rows == [["ä".encode("UTF-8"), None, b'a"b'], [b"x;y"]]
+
+    @pytest.mark.parametrize("block_rows", [1, 2, 10000])
+    def test_numbers_are_converted_per_block(self, monkeypatch, block_rows):
+        """Numeric columns are converted into masked arrays while parsing, missing values are masked."""
+        monkeypatch.setattr(csv_module, "_BLOCK_ROWS", block_rows)
+        monkeypatch.setattr(csv_module, "_BLOCK_SIZE", 8)
+        csv = '"i";"f"\r\n"1";"1.5"\r\n;\r\n"-3";"NaN"\r\n" 4";"-2e3"\r\n'
+        for data in (csv, io.BytesIO(csv.encode("UTF-8"))):
+            result = from_cadenza_csv(data, type_mapping={"i": "Int64", "f": "Float64"})
+            assert isinstance(result["i"].array, pd.arrays.IntegerArray)
+            assert isinstance(result["f"].array, pd.arrays.FloatingArray)
+            assert list(result["i"].isna()) == [False, True, False, False]
+            assert result["i"].iloc[3] == 4
+            assert list(result["f"].isna()) == [False, True, False, False]
+            assert np.isnan(result["f"].iloc[2])
+            assert result["f"].iloc[3] == -2000.0
+
+    def test_numbers_with_headers_only(self):
+        """Numeric columns without rows are empty masked arrays."""
+        result = from_cadenza_csv('"i";"f"\r\n', type_mapping={"i": "Int64", "f": "Float64"})
+        assert len(result) == 0
+        assert list(result.dtypes) == ["Int64", "Float64"]
+
+    def test_numbers_with_non_ascii_digits(self):
+        """Numbers the built-in conversion rejects are converted like pandas does."""
+        csv = '"i"\r\n"1"\r\n"١٢"\r\n\r\n'
+        for data in (csv, csv.encode("UTF-8")):
+            result = from_cadenza_csv(data, type_mapping={"i": "Int64"})
+            assert list(result["i"].astype(object)) == [1, 12, pd.NA]
+
+    def test_datetime_layouts(self):
+        """Datetimes with Z or +hh:mm offsets, with or without (fractional) seconds, are converted to UTC."""
+        csv = (
+            '"timestamp"\r\n'
+            '"2023-01-03T15:29:13Z"\r\n'
+            '"2023-01-03T16:29:13.5+01:00"\r\n'
+            '"2023-01-03T10:29-05:00"\r\n'
+            '\r\n'
+            '"2023-01-03T15:29:13.123456789Z"\r\n'
+            '"2023-01-03T16:29:13+01:00"\r\n'
+        )
+        result = from_cadenza_csv(csv, datetime_columns=["timestamp"])
+        assert str(result["timestamp"].dtype) == "datetime64[ns, UTC]"
+        assert list(result["timestamp"]) == [
+            pd.Timestamp("2023-01-03T15:29:13Z"),
+            pd.Timestamp("2023-01-03T15:29:13.5Z"),
+            pd.Timestamp("2023-01-03T15:29:00Z"),
+            pd.NaT,
+            pd.Timestamp("2023-01-03T15:29:13.123456789Z"),
+            pd.Timestamp("2023-01-03T15:29:13Z"),
+        ]
+
+    def test_datetime_other_layouts(self):
+        """Values in other layouts or with invalid dates are parsed by pandas."""
+        csv = (
+            '"timestamp"\r\n'
+            '"2023-01-03T15:29:13Z"\r\n'
+            '"2023-02-30T15:29:13Z"\r\n'
+            '"1500-01-03T15:29:13Z"\r\n'
+            '"2023-01-03"\r\n'
+            '"invalid"\r\n'
+        )
+        result = from_cadenza_csv(csv, datetime_columns=["timestamp"])
+        assert result["timestamp"].iloc[0] == pd.Timestamp("2023-01-03T15:29:13Z")
+        assert result["timestamp"].iloc[1:3].isna().all()
+        assert result["timestamp"].iloc[3] == pd.Timestamp("2023-01-03T00:00:00Z")
+        assert pd.isna(result["timestamp"].iloc[4])
+
+    def test_datetime_repeated_values(self):
+        """Repeated datetimes are parsed once and result in equal timestamps."""
+        rows = "".join(f'"2023-01-0{i % 3 + 1}T00:00:00+01:00"\r\n\r\n' for i in range(10))
+        result = from_cadenza_csv('"timestamp"\r\n' + rows, datetime_columns=["timestamp"])
+        assert len(result) == 20
+        assert result["timestamp"].iloc[6] == pd.Timestamp("2022-12-31T23:00:00Z")
+        assert result["timestamp"].iloc[1::2].isna().all()
+
+    @pytest.mark.parametrize("max_workers", [1, 2, 3])
+    def test_geometries_parsed_in_parallel(self, monkeypatch, max_workers):
+        """Large geometry columns are parsed in chunks on a thread pool with the same result."""
+        executors = []
+        monkeypatch.setattr(csv_module, "ThreadPoolExecutor",
+                            lambda **kwargs: executors.append(kwargs) or ThreadPoolExecutor(**kwargs))
+        rows = "".join(f'"POINT ({i} {i})"\r\n' if i % 4 else '\r\n' for i in range(10))
+        csv = '"geometry"\r\n' + rows
+        result = from_cadenza_csv(csv, geometry_columns=["geometry"], max_workers=max_workers, parallel_threshold=5)
+
+        assert executors == ([] if max_workers == 1 else [{"max_workers": max_workers}])
+        assert [None if g is None else g.x for g in result["geometry"]] == [
+            None if i % 4 == 0 else float(i) for i in range(10)]
+
+    def test_small_geometry_column_is_parsed_on_calling_thread(self, monkeypatch):
+        """Columns with fewer values than the threshold are not parsed on a thread pool."""
+        monkeypatch.setattr(csv_module, "ThreadPoolExecutor", None)
+        result = from_cadenza_csv('"geometry"\r\n"POINT (1 2)"\r\n', geometry_columns=["geometry"], max_workers=4)
+        assert result.iloc[0, 0] == Point(1, 2)
+
+    def test_invalid_geometry_in_parallel(self):
+        """Invalid WKT results in None with a warning when parsed in parallel as well."""
+        csv = '"geometry"\r\n"POINT (1 2)"\r\n"INVALID"\r\n"POINT (3 4)"\r\n'
+        with pytest.warns(Warning):
+            result = from_cadenza_csv(csv, geometry_columns=["geometry"], max_workers=2, parallel_threshold=1)
+        assert result.iloc[1, 0] is None
+        assert result.iloc[2, 0] == Point(3, 4)
+
+    def test_columns_are_converted_when_read(self, monkeypatch):
+        """Parsed columns are converted once, when they are first read."""
+        converted = []
+        convert_column = csv_module._convert_column  # pylint: disable=protected-access
+        monkeypatch.setattr(csv_module, "_convert_column",
+                            lambda values, **kwargs: converted.append(values) or convert_column(values, **kwargs))
+        csv = '"id";"name";"geometry"\r\n"1";"a";"POINT (1 2)"\r\n"2";;\r\n'
+        columns = parse_cadenza_csv(csv, type_mapping={"id": "Int64", "name": "string"},
+                                    geometry_columns=["geometry"])
+        assert columns.names == ["id", "name", "geometry"]
+        assert not converted
+
+        selected = columns.to_frame(["name", "id"])
+        assert list(selected.columns) == ["name", "id"]
+        assert selected["name"].dtype == "string"
+        assert converted == [["a", None]]
+
+        df = columns.to_frame()
+        assert len(converted) == 2
+        assert df.iloc[0, 2] == Point(1, 2)
+        pd.testing.assert_frame_equal(df, from_cadenza_csv(csv, type_mapping={"id": "Int64", "name": "string"},
+                                                           geometry_columns=["geometry"]))
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_columns_converted_in_parallel(self, monkeypatch, lazy):
+        """Columns of at least parallel_threshold rows are converted concurrently, one task per column."""
+        # both conversions have to wait for each other, which fails unless they run at the same time
+        barrier = threading.Barrier(2, timeout=10)
+        convert_column = csv_module._convert_column  # pylint: disable=protected-access
+        monkeypatch.setattr(csv_module, "_convert_column",
+                            lambda values, **kwargs: barrier.wait() is None or convert_column(values, **kwargs))
+        csv = '"id";"name";"time"\r\n"1";"a";"2023-01-03T15:29:13Z"\r\n"2";;\r\n'
+        kwargs = {"type_mapping": {"id": "Int64", "name": "string"}, "datetime_columns": ["time"]}
+        parse = parse_cadenza_csv if lazy else from_cadenza_csv
+        result = parse(csv, max_workers=2, parallel_threshold=2, **kwargs)
+        if lazy:
+            result = result.to_frame(["time", "id", "name"])[["id", "name", "time"]]
+        monkeypatch.setattr(csv_module, "_convert_column", convert_column)
+        pd.testing.assert_frame_equal(result, from_cadenza_csv(csv, max_workers=1, **kwargs))
+
+    @pytest.mark.parametrize("max_workers", [2, 4, 5])
+    def test_parallel_columns_share_max_workers(self, monkeypatch, max_workers):
+        """Geometry columns converted concurrently parse their chunks with their share of max_workers."""
+        executors = []
+        monkeypatch.setattr(csv_module, "ThreadPoolExecutor",
+                            lambda **kwargs: executors.append(kwargs["max_workers"]) or ThreadPoolExecutor(**kwargs))
+        rows = "".join(f'"POINT ({i} {i})";"LINESTRING (0 0, {i} 1)"\r\n' for i in range(10))
+        result = from_cadenza_csv('"a";"b"\r\n' + rows, geometry_columns=["a", "b"], max_workers=max_workers,
+                                  parallel_threshold=5)
+
+        chunk_workers = max_workers // 2
+        assert executors == [2] + ([chunk_workers] * 2 if chunk_workers > 1 else [])
+        assert 2 * chunk_workers <= max_workers
+        assert [g.x for g in result["a"]] == [float(i) for i in range(10)]
+
+    def test_small_columns_converted_on_calling_thread(self, monkeypatch):
+        """Columns with fewer values than the threshold are converted one after another."""
+        monkeypatch.setattr(csv_module, "ThreadPoolExecutor", None)
+        result = from_cadenza_csv('"a";"b"\r\n"x";"POINT (1 2)"\r\n', type_mapping={"a": "string"},
+                                  geometry_columns=["b"], max_workers=4)
+        assert result.iloc[0].tolist() == ["x", Point(1, 2)]
+
+    def test_unknown_column_is_not_selected(self):
+        """Selecting a column that does not exist raises a KeyError."""
+        columns = parse_cadenza_csv('"a"\r\n"1"\r\n')
+        with pytest.raises(KeyError):
+            columns.to_frame(["b"])
+
+    @pytest.mark.parametrize("block_rows", [1, 10000])
+    def test_selected_columns(self, monkeypatch, block_rows):
+        """Only the selected columns are parsed, in the order of the data."""
+        monkeypatch.setattr(csv_module, "_BLOCK_ROWS", block_rows)
+        csv = '"a";"b";"c";"d"\r\n"1";"x";"2023-01-03T15:29:13Z";"POINT (1 2)"\r\n"2";"y"\r\n'
+        result = from_cadenza_csv(csv, type_mapping={"a": "Int64", "b": "string"},
+                                  datetime_columns=["c"], geometry_columns=["d"], columns=["d", "a", "unknown"])
+        assert list(result.columns) == ["a", "d"]
+        assert list(result["a"]) == [1, 2]
+        assert result["d"].iloc[0] == Point(1, 2)
+        assert result["d"].iloc[1] is None
+
+    @pytest.mark.parametrize("block_rows", [1, 2, 10000])
+    def test_categorical_columns(self, monkeypatch, block_rows):
+        """Categorical columns are dictionary-encoded while parsing, missing values stay missing."""
+        monkeypatch.setattr(csv_module, "_BLOCK_ROWS", block_rows)
+        csv = '"city";"name"\r\n"Köln";"a"\r\n;"b"\r\n"Bonn";"c"\r\n"Köln";"d"\r\n"";"e"\r\n'
+        for data in (csv, csv.encode("UTF-8")):
+            result = from_cadenza_csv(data, type_mapping={"city": "string", "name": "string"},
+                                      categorical_columns=["city"])
+            assert isinstance(result["city"].dtype, pd.CategoricalDtype)
+            assert list(result["city"].cat.categories) == ["Köln", "Bonn", ""]
+            assert list(result["city"].astype(object)) == ["Köln", np.nan, "Bonn", "Köln", ""]
+            assert result["name"].dtype == "string"
+
+    @pytest.mark.parametrize("data_type", [str, bytes, memoryview])
+    def test_segments(self, monkeypatch, data_type):
+        """Segments of the data are parsed on the executor into the same columns as the whole data."""
+        csv = '"i";"s";"c"\r\n' + ''.join(
+            f'"{i}";"multi\r\n""line"" {i}";"{i % 3}"\r\n' if i % 4 else ';"";\r\n\r\n' for i in range(40))
+        kwargs = {"type_mapping": {"i": "Int64", "s": "string"}, "categorical_columns": ["c"],
+                  "pyarrow_threshold": None}
+        expected = from_cadenza_csv(csv, **kwargs)
+        # segments of at least 16 bytes
+        monkeypatch.setattr(csv_module, "_BLOCK_SIZE", 16)
+        data = csv if data_type is str else data_type(csv.encode("UTF-8"))
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with patch.object(executor, "submit", wraps=executor.submit) as submit:
+                result = from_cadenza_csv(data, max_workers=5, executor=executor, **kwargs)
+                selected = from_cadenza_csv(data, max_workers=5, executor=executor, columns=["c", "s"], **kwargs)
+        assert submit.call_count == 10
+        pd.testing.assert_frame_equal(result, expected)
+        pd.testing.assert_frame_equal(selected, expected[["s", "c"]])
+
+    def test_segments_with_unquoted_values(self, monkeypatch):
+        """Data with unquoted values, whose quotes do not tell the record boundaries, is not split."""
+        monkeypatch.setattr(csv_module, "_BLOCK_SIZE", 4)
+        csv = '"a";"b"\r\n' + '"1";x"\r\n' * 10
+        executor = ThreadPoolExecutor(max_workers=2)
+        with patch.object(executor, "submit") as submit:
+            result = from_cadenza_csv(csv, max_workers=2, executor=executor, pyarrow_threshold=None)
+        executor.shutdown()
+        assert not submit.called
+        pd.testing.assert_frame_equal(result, from_cadenza_csv(csv, max_workers=1, pyarrow_threshold=None))
+
+    @pytest.mark.parametrize("csv, count, offsets", [
+        (b'"a"\r\n"1"\r\n"2"\r\n"3"\r\n', 3, [5, 15, 20]),
+        (b'"a"\r\n"1\r\n2"\r\n"3"\r\n', 3, [5, 13, 18]),
+        (b'"a"\r\n"1"\r\n', 4, [5, 10]),
+        (b'"a"\r\n""""\r\n"\r\n"\r\n', 3, [5, 11, 17]),
+    ])
+    def test_split_records(self, csv, count, offsets):
+        """Segments begin after a CRLF outside of quoted values."""
+        assert records.split_records(np.frombuffer(csv, dtype=np.uint8), 5, count) == offsets
+
+    @pytest.mark.parametrize("pyarrow_threshold", [None, 0])
+    def test_downcast_numbers(self, pyarrow_threshold):
+        """Numeric columns are stored in the narrowest type that holds their values."""
+        if pyarrow_threshold is not None:
+            pytest.importorskip("pyarrow")
+        csv = ('"i8";"i16";"i32";"i64";"f32";"f64";"n"\r\n'
+               '"-128";"128";"-32769";"2147483648";"0.5";"0.1";"1"\r\n'
+               '"127";;"1";"1";"NaN";"1.5";\r\n')
+        type_mapping = {"i8": "Int64", "i16": "Int64", "i32": "Int64", "i64": "Int64", "f32": "Float64",
+                        "f64": "Float64", "n": "Int64"}
+        result = from_cadenza_csv(csv, type_mapping=type_mapping, pyarrow_threshold=pyarrow_threshold,
+                                  downcast_numbers=True)
+        assert [str(dtype) for dtype in result.dtypes] == ["int8", "Int16", "int32", "int64", "float32", "float64",
+                                                          "Int8"]
+        assert result["i8"].tolist() == [-128, 127]
+        assert result["i16"].tolist() == [128, pd.NA]
+        assert result["f32"].iloc[0] == 0.5
+        assert np.isnan(result["f32"].iloc[1])
+        assert result["f64"].tolist() == [0.1, 1.5]
+
+    @pytest.mark.parametrize("pyarrow_threshold", [None, 0])
+    def test_numpy_dtype_backend(self, pyarrow_threshold):
+        """Columns are plain NumPy arrays, only integer columns with missing values are masked."""
+        if pyarrow_threshold is not None:
+            pytest.importorskip("pyarrow")
+        csv = ('"i";"n";"f";"s";"t"\r\n'
+               '"1";"2";"1.5";"a";"2023-01-03T15:29:13Z"\r\n'
+               '"3";;;;\r\n'
+               '"-5";"4";"NaN";"b";\r\n')
+        result = from_cadenza_csv(csv, type_mapping={"i": "Int64", "n": "Int64", "f": "Float64", "s": "string"},
+                                  datetime_columns=["t"], pyarrow_threshold=pyarrow_threshold,
+                                  dtype_backend=DtypeBackend.NUMPY)
+        assert [str(dtype) for dtype in result.dtypes] == ["int64", "Int64", "float64", "object",
+                                                          "datetime64[ns, UTC]"]
+        assert result["i"].tolist() == [1, 3, -5]
+        assert result["n"].tolist() == [2, pd.NA, 4]
+        # missing values and NaN are both NaN
+        assert result["f"].iloc[0] == 1.5
+        assert result["f"].iloc[1:].isna().all()
+        assert result["s"].tolist() == ["a", None, "b"]
+        assert result["t"].iloc[0] == pd.Timestamp("2023-01-03T15:29:13Z")
+        assert pd.isna(result["t"].iloc[1])
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
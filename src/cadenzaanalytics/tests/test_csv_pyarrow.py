@@ -0,0 +1,145 @@
+"""Unit tests for the pyarrow support of the Cadenza CSV parser."""
+import sys
+from unittest.mock import patch
+
+from shapely.geometry import Point
+import numpy as np
+import pandas as pd
+import pytest
+from cadenzaanalytics.util import csv as csv_module
+from cadenzaanalytics.data.dtype_backend import DtypeBackend
+from cadenzaanalytics.util.csv import from_cadenza_csv
+
+
+class TestCadenzaCsvPyarrow:
+    """Test suite for the pyarrow dtype backend and CSV reader of from_cadenza_csv."""
+
+    def test_pyarrow_dtype_backend(self):
+        """Typed columns are parsed into Arrow-backed dtypes, geometries and untyped columns are not."""
+        pa = pytest.importorskip("pyarrow")
+        csv = ('"i";"f";"s";"t";"g";"o"\r\n'
+               '"1";"1.5";"a""b";"2023-01-03T15:29:13.1234567Z";"POINT (1 2)";"x"\r\n'
+               ';"NaN";;;;\r\n'
+               '"3";;"ä";"2023-06-15T10:00:00+01:00";;"y"\r\n')
+        for data in (csv, csv.encode("UTF-8")):
+            result = from_cadenza_csv(data, type_mapping={"i": "Int64", "f": "Float64", "s": "string", "t": "string"},
+                                      datetime_columns=["t"], geometry_columns=["g"],
+                                      dtype_backend=DtypeBackend.PYARROW)
+            assert result["i"].dtype == pd.ArrowDtype(pa.int64())
+            assert result["f"].dtype == pd.ArrowDtype(pa.float64())
+            assert result["s"].dtype == pd.StringDtype("pyarrow")
+            assert result["t"].dtype == pd.ArrowDtype(pa.timestamp("us", tz="UTC"))
+            assert result["o"].dtype == object
+            assert result["i"].tolist() == [1, pd.NA, 3]
+            # NaN is a value, a missing value is null
+            assert np.isnan(result["f"].iloc[1])
+            assert pd.isna(result["f"].iloc[2]) and result["f"].iloc[2] is pd.NA
+            assert result["s"].tolist() == ['a"b', pd.NA, "ä"]
+            assert result["t"].iloc[0] == pd.Timestamp("2023-01-03T15:29:13.123456Z")
+            assert result["t"].iloc[2] == pd.Timestamp("2023-06-15T09:00:00Z")
+            assert pd.isna(result["t"].iloc[1])
+            assert result["g"].iloc[0] == Point(1, 2)
+
+    @pytest.mark.parametrize("dtype_backend", list(DtypeBackend))
+    def test_pyarrow_reader(self, dtype_backend):
+        """Data above the threshold is read by pyarrow into the same columns as by the Python parser."""
+        pytest.importorskip("pyarrow")
+        csv = ('"i";"f";"s";"c";"t";"g";"o"\r\n'
+               '"1";"1.5";"a""b;c";"x";"2023-01-03T15:29:13Z";"POINT (1 2)";"y"\r\n'
+               ';"NaN";"";;;;\r\n'
+               '"-3";;;"x";"2023-06-15T10:00:00+01:00";;"z"\r\n')
+        kwargs = {"type_mapping": {"i": "Int64", "f": "Float64", "s": "string"}, "datetime_columns": ["t"],
+                  "geometry_columns": ["g"], "categorical_columns": ["c"], "dtype_backend": dtype_backend}
+        expected = from_cadenza_csv(csv, pyarrow_threshold=None, **kwargs)
+        for data in (csv, csv.encode("UTF-8"), memoryview(csv.encode("UTF-8"))):
+            with patch.object(csv_module.arrow, "read_csv", wraps=csv_module.arrow.read_csv) as read_csv:
+                result = from_cadenza_csv(data, pyarrow_threshold=len(csv), **kwargs)
+            assert read_csv.called
+            pd.testing.assert_frame_equal(result, expected)
+            # columns of the Python parser and of pyarrow can be modified alike
+            result.loc[0, "i"] = 5
+
+    def test_pyarrow_reader_selected_columns(self):
+        """Only the selected columns are read by pyarrow, in the order of the data."""
+        pytest.importorskip("pyarrow")
+        csv = '"a";"b";"c"\r\n"1";"x";"2"\r\n'
+        result = from_cadenza_csv(csv, type_mapping={"a": "Int64", "c": "Int64"}, columns=["c", "a", "unknown"],
+                                  pyarrow_threshold=0)
+        assert list(result.columns) == ["a", "c"]
+        assert list(result["c"]) == [2]
+
+    @pytest.mark.parametrize("csv", [
+        '"a";"b"\r\n"1";x\r\n',  # unquoted value
+        '"a";"b"\r\n"1"\r\n"2";"3"\r\n',  # missing value at the end of a row
+        '"a";"b"\r\n"1";',  # semicolon at the end of the data
+        '"a";"a"\r\n"1";"2"\r\n',  # duplicate column name
+        '"a";"b"\r\n"1_000";"2"\r\n',  # number pyarrow does not accept
+        '"a";"b"\r\n"1";"x\r\ny"\r\n',  # line break within a quoted value
+    ])
+    def test_pyarrow_reader_falls_back_to_python_parser(self, csv):
+        """Data that pyarrow does not read exactly like the Python parser is parsed by the Python parser."""
+        pytest.importorskip("pyarrow")
+        kwargs = {"type_mapping": {"a": "Int64", "b": "string"}}
+        parse_columns = csv_module._parse_columns  # pylint: disable=protected-access
+        with patch.object(csv_module, "_parse_columns", wraps=parse_columns) as parse_columns:
+            result = from_cadenza_csv(csv.encode("UTF-8"), pyarrow_threshold=0, **kwargs)
+        assert parse_columns.called
+        pd.testing.assert_frame_equal(result, from_cadenza_csv(csv, pyarrow_threshold=None, **kwargs))
+
+    @pytest.mark.parametrize("csv", [
+        '"a";"b"\r\n"1";"x"y\r\n',  # character after a closing quote
+        '"a";"b"\r\n"1" ;"x"\r\n',  # space after a closing quote
+        '"a";"b"\r\n"0x10";"x"\r\n',  # hexadecimal integer
+        '"a";"b"\r\n"0X1F";"x"\r\n',  # hexadecimal integer
+    ])
+    def test_malformed_data_is_rejected_by_both_readers(self, csv):
+        """Data that the Python parser rejects is rejected regardless of its size, not read by pyarrow."""
+        pytest.importorskip("pyarrow")
+        kwargs = {"type_mapping": {"a": "Int64", "b": "string"}}
+        for pyarrow_threshold in (None, 0):
+            with pytest.raises(ValueError):
+                from_cadenza_csv(csv.encode("UTF-8"), pyarrow_threshold=pyarrow_threshold, **kwargs)
+
+    def test_quoted_line_breaks_across_blocks(self):
+        """Quoted CRLFs are read as they are, even where pyarrow would split them between its blocks."""
+        pytest.importorskip("pyarrow")
+        from pyarrow import csv as pa_csv  # pylint: disable=import-outside-toplevel
+        read_options = pa_csv.ReadOptions
+        csv = ('"a";"b"\r\n' + "".join(f'"{i}";"x\r\ny"\r\n' for i in range(200))).encode("UTF-8")
+        kwargs = {"type_mapping": {"a": "Int64"}}
+        with patch.object(pa_csv, "ReadOptions", lambda **options: read_options(block_size=64, **options)):
+            result = from_cadenza_csv(csv, pyarrow_threshold=0, **kwargs)
+        assert set(result["b"]) == {"x\r\ny"}
+        pd.testing.assert_frame_equal(result, from_cadenza_csv(csv, pyarrow_threshold=None, **kwargs))
+
+    def test_hexadecimal_text_is_read(self):
+        """Text that begins with 0x is read as it is, by the Python parser if there are Int64 columns."""
+        csv = '"a";"b"\r\n"1";"0x10"\r\n'
+        for pyarrow_threshold in (None, 0):
+            result = from_cadenza_csv(csv, type_mapping={"a": "Int64"}, pyarrow_threshold=pyarrow_threshold)
+            assert result["b"].tolist() == ["0x10"]
+
+    def test_pyarrow_reader_is_optional(self, monkeypatch):
+        """Without pyarrow installed, data above the threshold is parsed by the Python parser."""
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        result = from_cadenza_csv('"a"\r\n"1"\r\n\r\n', type_mapping={"a": "Int64"}, pyarrow_threshold=0)
+        assert result["a"].tolist() == [1, pd.NA]
+
+    def test_pyarrow_dtype_backend_without_pyarrow(self, monkeypatch):
+        """Parsing into Arrow-backed dtypes without pyarrow installed fails with a helpful message."""
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        with pytest.raises(ImportError, match="cadenzaanalytics\\[arrow\\]"):
+            from_cadenza_csv('"a"\r\n"1"\r\n', type_mapping={"a": "Int64"}, dtype_backend=DtypeBackend.PYARROW)
+
+    def test_downcast_numbers_with_pyarrow_dtype_backend(self):
+        """Downcast numbers of the pyarrow dtype backend keep their missing values."""
+        pa = pytest.importorskip("pyarrow")
+        result = from_cadenza_csv('"i";"f"\r\n"1";"0.25"\r\n;\r\n', type_mapping={"i": "Int64", "f": "Float64"},
+                                  dtype_backend=DtypeBackend.PYARROW, downcast_numbers=True)
+        assert result["i"].dtype == pd.ArrowDtype(pa.int8())
+        assert result["f"].dtype == pd.ArrowDtype(pa.float32())
+        assert result["i"].isna().tolist() == [False, True]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -8,6 +8,7 @@ from shapely.geometry import Point, LineString, Polygon, MultiPoint
 import pandas as pd
 import numpy as np
 import pytest
+from cadenzaanalytics.data.dtype_backend import DtypeBackend
 from cadenzaanalytics.util.csv import from_cadenza_csv, to_cadenza_csv
 
 #pylint: disable=too-many-public-methods
@@ -595,5 +596,28 @@ class TestCadenzaCsvRoundtrip:
         assert csv2 == csv3
 
 
+    def test_downcast_numbers_roundtrip(self):
+        """Downcast numbers are written like the values of their declared Int64 and Float64 columns."""
+        csv1 = '"i";"f";"g"\r\n"1";"0.1";"0.5"\r\n;"NaN";"16777216.0"\r\n"-3";;"-2.25"\r\n'
+        kwargs = {"type_mapping": {"i": "Int64", "f": "Float64", "g": "Float64"}}
+        df1 = from_cadenza_csv(csv1, downcast_numbers=True, **kwargs)
+        assert df1["g"].dtype == np.float32
+
+        csv2 = to_cadenza_csv(df1, float_columns=["f", "g"], int_columns=["i"])
+        assert csv2 == to_cadenza_csv(from_cadenza_csv(csv1, **kwargs), float_columns=["f", "g"], int_columns=["i"])
+        assert csv2.splitlines()[1] == '"1";"0.1";"0.5"'
+
+    def test_numpy_dtype_backend_roundtrip(self):
+        """Columns of the NumPy dtype backend are written like those of the nullable dtype backend."""
+        csv1 = '"i";"n";"f";"s"\r\n"1";"2";"0.1";"a"\r\n"3";;;\r\n"-5";"4";"NaN";""\r\n'
+        kwargs = {"type_mapping": {"i": "Int64", "n": "Int64", "f": "Float64", "s": "string"}}
+        df1 = from_cadenza_csv(csv1, dtype_backend=DtypeBackend.NUMPY, **kwargs)
+        assert df1["f"].dtype == np.float64
+
+        csv2 = to_cadenza_csv(df1, float_columns=["f"], int_columns=["i", "n"])
+        assert csv2 == to_cadenza_csv(from_cadenza_csv(csv1, **kwargs), float_columns=["f"], int_columns=["i", "n"])
+        assert csv2.splitlines()[2:] == ['"3";;"NaN";', '"-5";"4";"NaN";""']
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
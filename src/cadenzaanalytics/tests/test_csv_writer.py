@@ -1,11 +1,16 @@
 """Unit tests for Cadenza CSV writer."""
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from unittest.mock import patch
 
 from shapely.geometry import Point, LineString, MultiPoint, MultiLineString, Polygon
 import pandas as pd
 import numpy as np
 import pytest
-from cadenzaanalytics.util.csv import to_cadenza_csv
+from cadenzaanalytics.data.float_precision import FloatPrecision
+from cadenzaanalytics.data.geometry_precision import GeometryPrecision
+from cadenzaanalytics.util import formatting, writer
+from cadenzaanalytics.util.csv import iter_cadenza_csv, to_cadenza_csv
 
 #pylint: disable=too-many-public-methods
 class TestCadenzaCsvWriter:
@@ -431,5 +436,130 @@ class TestCadenzaCsvWriter:
         # Both INT64 columns should have empty for None
         assert result == '"int_col1";"int_col2"\r\n"1";"10"\r\n"2";"20"\r\n"3";"13"\r\n'
 
+    def test_pyarrow_float_precision(self):
+        """Arrow-backed float columns are written with the precision of their column."""
+        pytest.importorskip("pyarrow")
+        df = pd.DataFrame({"f": pd.array([1.005, None, np.nan], dtype="double[pyarrow]")})
+        assert to_cadenza_csv(df, float_columns=["f"], float_precision={"f": FloatPrecision(significant_digits=2)}) \
+            == '"f"\r\n"1"\r\n"NaN"\r\n"NaN"\r\n'
+
+    def test_pyarrow_columns(self):
+        """Arrow-backed columns are written like the corresponding NumPy-backed columns."""
+        pa = pytest.importorskip("pyarrow")
+        df = pd.DataFrame({
+            "int_col": pd.array([1, None, -3], dtype="int64[pyarrow]"),
+            "float_col": pd.array([1.5, None, 1e16], dtype="double[pyarrow]"),
+            "double_col": pd.array([np.nan, -0.0, 1e-05], dtype="double[pyarrow]"),
+            "str_col": pd.array(['say "hi"', None, "ä;b"], dtype="string[pyarrow]"),
+            "dt_col": pd.array([datetime(2023, 1, 3, 15, 29, 13, 999999, tzinfo=timezone.utc), None,
+                                datetime(1969, 12, 31, 23, 59, 59, 500000, tzinfo=timezone.utc)],
+                               dtype=pd.ArrowDtype(pa.timestamp("us", tz="UTC"))),
+        })
+        expected = ('"int_col";"float_col";"double_col";"str_col";"dt_col"\r\n'
+                    '"1";"1.5";;"say ""hi""";"2023-01-03T15:29:13Z"\r\n'
+                    ';"NaN";"-0.0";;\r\n'
+                    '"-3";"1e+16";"1e-05";"ä;b";"1969-12-31T23:59:59Z"\r\n')
+        kwargs = {"float_columns": ["float_col"], "int_columns": ["int_col"], "datetime_columns": ["dt_col"]}
+        assert to_cadenza_csv(df, **kwargs) == expected
+        assert to_cadenza_csv(df.astype(object), **kwargs) == expected
+
+    def test_columns_are_formatted_like_values(self):
+        """Columns are formatted at once into the same fields as their values one by one."""
+        timestamps = pd.Series(pd.to_datetime(["2023-01-03T15:29:13.999", None, "1969-12-31T23:59:59.5",
+                                               "2023-07-01T12:00:00.000"]))
+        df = pd.DataFrame({
+            "int_col": pd.array([1, None, -3, 2 ** 62], dtype="Int64"),
+            "float_col": [1.5, np.nan, 1e16, -0.0],
+            "float32_col": pd.arrays.FloatingArray(np.array([0.1, np.nan, np.inf, 1e-05], dtype=np.float32),
+                                                   np.array([False, False, False, True])),
+            "float_int_col": [1.9, np.nan, -2.9, 1e15],
+            "bool_col": [True, False, True, False],
+            "str_col": ['say "hi"', None, "ä;b", "multi\r\nline"],
+            "cat_col": pd.Categorical(["x", None, "y", "x"]),
+            "utc_col": timestamps.dt.tz_localize("UTC"),
+            "berlin_col": timestamps.dt.tz_localize("UTC").dt.tz_convert("Europe/Berlin"),
+            "naive_col": timestamps,
+            "geo_col": [Point(1, 2), None, Polygon([(0, 0), (1, 0), (1, 1)]), Point(0.1234567, 1)],
+        })
+        kwargs = {"float_columns": ["float_col"], "int_columns": ["int_col", "float_int_col"],
+                  "datetime_columns": ["utc_col", "berlin_col", "naive_col"], "geometry_columns": ["geo_col"]}
+        result = to_cadenza_csv(df, **kwargs)
+        assert result.splitlines()[1:3] == [
+            '"1";"1.5";"0.1";"1";"True";"say ""hi""";"x";"2023-01-03T15:29:13Z";"2023-01-03T16:29:13+01:00";'
+            '"2023-01-03T15:29:13";"POINT (1 2)"',
+            ';"NaN";;;"False";;;;;;',
+        ]
+        assert result.splitlines()[3].endswith('"1969-12-31T23:59:59Z";"1970-01-01T00:59:59+01:00";'
+                                               '"1969-12-31T23:59:59";"POLYGON ((0 0, 1 0, 1 1, 0 0))"')
+        with patch.object(formatting, "format_column", return_value=None):
+            assert to_cadenza_csv(df, **kwargs) == result
+
+    @pytest.mark.parametrize("rows", [0, 1, 5, 6])
+    def test_iter_cadenza_csv(self, rows):
+        """The chunks of CSV data are the encoded CSV data of to_cadenza_csv, the first with the header."""
+        df = pd.DataFrame({"id": range(rows), "text": ['ä;"b"'] * rows,
+                           "value": [np.nan, 1.5] * (rows // 2) + [0.5] * (rows % 2)})
+        chunks = list(iter_cadenza_csv(df, float_columns=["value"], int_columns=["id"], chunk_rows=2))
+        assert b"".join(chunks) == to_cadenza_csv(df, float_columns=["value"], int_columns=["id"]).encode("utf-8")
+        assert len(chunks) == max(1, (rows + 1) // 2)
+        assert chunks[0].startswith(b'"id";"text";"value"\r\n')
+        assert not list(iter_cadenza_csv(pd.DataFrame()))
+
+    @pytest.mark.parametrize("rows", [0, 1, 5, 13])
+    def test_parallel_chunks(self, rows):
+        """Chunks formatted in parallel are written in the order of their rows."""
+        df = pd.DataFrame({"id": range(rows), "text": [f'"{i}"' for i in range(rows)],
+                           "value": [i / 3 if i % 4 else np.nan for i in range(rows)]})
+        kwargs = {"float_columns": ["value"], "int_columns": ["id"]}
+        expected = to_cadenza_csv(df, **kwargs)
+        assert to_cadenza_csv(df, **kwargs, max_workers=3, chunk_rows=2) == expected
+        assert b"".join(iter_cadenza_csv(df, **kwargs, chunk_rows=2, max_workers=3)) == expected.encode("utf-8")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert to_cadenza_csv(df, **kwargs, executor=executor, chunk_rows=3) == expected
+
+    def test_small_frames_are_formatted_on_calling_thread(self):
+        """Frames that fit into a single chunk are formatted without a thread pool."""
+        df = pd.DataFrame({"id": range(5)})
+        with patch.object(writer, "ThreadPoolExecutor") as pool:
+            assert to_cadenza_csv(df, int_columns=["id"], max_workers=4, chunk_rows=5).count("\r\n") == 6
+            assert len(list(iter_cadenza_csv(df, int_columns=["id"], max_workers=4))) == 1
+        pool.assert_not_called()
+
+    def test_geometry_precision(self):
+        """Geometry columns are written with the precision of their column."""
+        df = pd.DataFrame({"a": [Point(1.23456789, 2.5), None], "b": [LineString([(0.004, 0), (1.996, 1.5)]), None],
+                           "c": [Point(1.23456789, 2.5), None]})
+        kwargs = {"geometry_columns": ["a", "b", "c"],
+                  "geometry_precision": {"a": GeometryPrecision(rounding_precision=2, trim=False),
+                                         "b": GeometryPrecision(rounding_precision=-1, grid_size=0.01)}}
+        expected = ('"a";"b";"c"\r\n'
+                    '"POINT (1.23 2.50)";"LINESTRING (0 0, 2 1.5)";"POINT (1.234568 2.5)"\r\n'
+                    ';;\r\n')
+        assert to_cadenza_csv(df, **kwargs) == expected
+        with patch.object(formatting, "format_column", return_value=None):
+            assert to_cadenza_csv(df, **kwargs) == expected
+
+    @pytest.mark.parametrize("dtype", ["float64", "Float64", "float32"])
+    def test_float_precision(self, dtype):
+        """Float columns are written with the precision of their column, missing values as "NaN"."""
+        values = [1234.5678, np.nan, 0.000012345, -0.5]
+        df = pd.DataFrame({"g": values, "f": values, "s": values}, dtype=dtype)
+        kwargs = {"float_columns": ["g", "f", "s"],
+                  "float_precision": {"g": FloatPrecision(significant_digits=3), "f": FloatPrecision(decimals=2)}}
+        result = to_cadenza_csv(df, **kwargs)
+        lines = result.splitlines()
+        assert [line.split(";")[:2] for line in lines[1:]] == [['"1.23e+03"', '"1234.57"'], ['"NaN"', '"NaN"'],
+                                                               ['"1.23e-05"', '"0.00"'], ['"-0.5"', '"-0.50"']]
+        assert result == to_cadenza_csv(df.astype(object), **kwargs)
+        assert to_cadenza_csv(df[["s"]], float_columns=["s"]) == to_cadenza_csv(
+            df[["s"]], float_columns=["s"], float_precision={"s": FloatPrecision()})
+
+    def test_float_precision_validation(self):
+        """Only one of significant digits and decimals can be given."""
+        with pytest.raises(ValueError):
+            FloatPrecision(significant_digits=3, decimals=2)
+        with pytest.raises(ValueError):
+            FloatPrecision(decimals=-1)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
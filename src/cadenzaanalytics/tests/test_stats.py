@@ -0,0 +1,88 @@
+"""Unit tests for the column statistics collected by the Cadenza CSV parser."""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from cadenzaanalytics.data.dtype_backend import DtypeBackend
+from cadenzaanalytics.util import csv as csv_module
+from cadenzaanalytics.util.csv import parse_cadenza_csv
+from cadenzaanalytics.util.stats import StatsCollector, frame_stats
+
+
+class TestColumnStats:
+    """Test suite for column statistics."""
+
+    @pytest.mark.parametrize("pyarrow_threshold", [None, 0])
+    def test_stats(self, pyarrow_threshold):
+        """Statistics of the columns are collected while they are parsed and converted."""
+        if pyarrow_threshold is not None:
+            pytest.importorskip("pyarrow")
+        csv = ('"i";"f";"s";"c";"t";"g"\r\n'
+               '"3";"1.5";"a";"x";"2023-01-03T15:29:13Z";"POINT (1 2)"\r\n'
+               ';"NaN";;;"2023-06-15T10:00:00+01:00";\r\n'
+               '"-1";;"b";"x";;"POINT (1 2)"\r\n'
+               '"3";"-2";"a";"y";;\r\n')
+        columns = parse_cadenza_csv(csv, type_mapping={"i": "Int64", "f": "Float64", "s": "string"},
+                                    datetime_columns=["t"], geometry_columns=["g"], categorical_columns=["c"],
+                                    pyarrow_threshold=pyarrow_threshold, collect_stats=True)
+        stats = {name: (column.count, column.null_count, column.distinct_count, column.min, column.max)
+                 for name, column in columns.stats.items()}
+        assert stats == {
+            "i": (4, 1, 2, -1, 3),
+            "f": (4, 1, 3, -2.0, 1.5),
+            "s": (4, 1, 2, None, None),
+            "c": (4, 1, 2, None, None),
+            "t": (4, 2, 2, pd.Timestamp("2023-01-03T15:29:13Z"), pd.Timestamp("2023-06-15T09:00:00Z")),
+            "g": (4, 2, 1, None, None),
+        }
+
+    def test_stats_of_numpy_floats(self):
+        """With the NumPy backend, NaN floats are missing for the Python parser, pyarrow and frame_stats alike."""
+        pytest.importorskip("pyarrow")
+        csv = '"f"\r\n"0.5"\r\n"NaN"\r\n\r\n'
+        results = []
+        for pyarrow_threshold in (None, 0):
+            columns = parse_cadenza_csv(csv, type_mapping={"f": "Float64"}, pyarrow_threshold=pyarrow_threshold,
+                                        dtype_backend=DtypeBackend.NUMPY, collect_stats=True)
+            results.append(columns.stats["f"])
+            results.append(frame_stats(columns.to_frame())["f"])
+        assert {str(stats) for stats in results} == {str(results[-1])}
+        assert (results[0].count, results[0].null_count, results[0].distinct_count) == (3, 2, 1)
+
+    def test_stats_of_segments(self, monkeypatch):
+        """Statistics of segments parsed in parallel are merged."""
+        csv = '"i"\r\n' + "".join(f'"{i % 1500}"\r\n' if i % 10 else "\r\n" for i in range(3000))
+        expected = parse_cadenza_csv(csv, type_mapping={"i": "Int64"}, collect_stats=True).stats["i"]
+        monkeypatch.setattr(csv_module, "_BLOCK_SIZE", 1000)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            stats = parse_cadenza_csv(csv, type_mapping={"i": "Int64"}, max_workers=4, executor=executor,
+                                      pyarrow_threshold=None, collect_stats=True).stats["i"]
+        assert str(stats) == str(expected)
+        assert (stats.count, stats.null_count, stats.min, stats.max) == (3000, 300, 1, 1499)
+        # an estimate of the 1350 distinct values
+        assert abs(stats.distinct_count - 1350) < 100
+
+    def test_stats_are_not_collected_by_default(self):
+        """Without collect_stats, the parsed columns have no statistics."""
+        assert parse_cadenza_csv('"a"\r\n"1"\r\n').stats is None
+
+    def test_distinct_count_estimate(self):
+        """Up to 1024 distinct values are counted exactly, more are estimated."""
+        collector = StatsCollector()
+        collector.add_numbers(np.arange(1024) % 1000, np.zeros(1024, dtype=bool))
+        assert collector.to_stats().distinct_count == 1000
+        collector.add_numbers(np.arange(100000), np.zeros(100000, dtype=bool))
+        assert abs(collector.to_stats().distinct_count - 100000) < 10000
+
+    def test_frame_stats(self):
+        """Statistics of a DataFrame are computed from its columns, NaN values of Float64 columns are present."""
+        df = pd.DataFrame({
+            "f": pd.arrays.FloatingArray(np.array([1.5, np.nan, 0.0]), np.array([False, False, True])),
+            "t": pd.to_datetime(["2023-01-03T15:29:13Z", None, "2022-01-01T00:00:00Z"], utc=True),
+            "c": pd.Categorical(["x", None, "x"], categories=["x", "unused"]),
+        })
+        stats = frame_stats(df)
+        assert (stats["f"].null_count, stats["f"].distinct_count, stats["f"].min, stats["f"].max) == (1, 2, 1.5, 1.5)
+        assert stats["t"].min == pd.Timestamp("2022-01-01T00:00:00Z")
+        assert (stats["c"].count, stats["c"].null_count, stats["c"].distinct_count) == (3, 1, 1)
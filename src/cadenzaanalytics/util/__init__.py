@@ -1,3 +1,4 @@
-from cadenzaanalytics.util.csv import from_cadenza_csv, to_cadenza_csv
+from cadenzaanalytics.util.csv import from_cadenza_csv
+from cadenzaanalytics.util.writer import iter_cadenza_csv, to_cadenza_csv
 
-__all__ = ['from_cadenza_csv', 'to_cadenza_csv']
+__all__ = ['from_cadenza_csv', 'iter_cadenza_csv', 'to_cadenza_csv']
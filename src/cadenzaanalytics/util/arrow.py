@@ -0,0 +1,152 @@
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from cadenzaanalytics.util import formatting
+
+
+# pyarrow.compute generates its functions at import time
+# pylint: disable=no-member,import-outside-toplevel
+
+_NUMPY_TYPES = {"Int64": np.int64, "Float64": np.float64}
+
+
+def optional_pyarrow():
+    """Import pyarrow, returns None if it is not installed."""
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def import_pyarrow():
+    """Import pyarrow, raises an ImportError that names the extra to install if it is not installed."""
+    try:
+        import pyarrow
+    except ImportError as err:
+        raise ImportError("The pyarrow dtype backend requires pyarrow, "
+                          "install it with `pip install cadenzaanalytics[arrow]`.") from err
+    return pyarrow
+
+
+def masked_array(data: np.ndarray, mask: np.ndarray) -> pd.api.extensions.ExtensionArray:
+    """Convert numbers and a mask of the missing values into an Arrow-backed array.
+
+    The mask marks missing values, NaN values of a float array stay NaN.
+    """
+    return pd.arrays.ArrowExtensionArray(import_pyarrow().array(data, mask=mask))
+
+
+def string_array(values: Sequence[Optional[Union[str, bytes]]], binary: bool) -> pd.api.extensions.ExtensionArray:
+    """Convert text or UTF-8 encoded values into a `string[pyarrow]` array."""
+    pa = import_pyarrow()
+    if binary:
+        # Arrow validates the UTF-8 encoding and reinterprets the bytes, no Python strings are created
+        return pd.arrays.ArrowStringArray(pa.array(values, type=pa.binary()).cast(pa.string()))
+    return pd.arrays.ArrowStringArray(pa.array(values, type=pa.string()))
+
+
+def timestamp_array(timestamps: pd.api.extensions.ExtensionArray) -> pd.api.extensions.ExtensionArray:
+    """Convert UTC timestamps into a `timestamp[us, tz=UTC][pyarrow]` array, truncating nanoseconds."""
+    pa = import_pyarrow()
+    import pyarrow.compute as pc
+    microseconds = pc.floor_temporal(pa.array(timestamps), unit='microsecond')
+    return pd.arrays.ArrowExtensionArray(microseconds.cast(pa.timestamp('us', tz='UTC')))
+
+
+def read_csv(data: Union[bytes, bytearray, memoryview, Any],
+             headers: List[str],
+             number_types: Dict[str, str],
+             use_threads: bool) -> Optional[List[Any]]:
+    """Read the given columns of Cadenza CSV data with the CSV reader of pyarrow.
+
+    Only quoted values can be present, unquoted empty values are read as null. The columns in
+    number_types are read as int64 or double, `"NaN"` as NaN, and all other columns as strings.
+
+    Returns None if pyarrow rejects the data, e.g. a row with fewer or more values than columns
+    or a number it cannot parse.
+    """
+    pa = import_pyarrow()
+    from pyarrow import csv as pa_csv
+
+    arrow_types = {"Int64": pa.int64(), "Float64": pa.float64()}
+    convert_options = pa_csv.ConvertOptions(
+        column_types={name: arrow_types.get(number_types.get(name), pa.string()) for name in headers},
+        include_columns=headers,
+        null_values=[''],
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=False)
+    parse_options = pa_csv.ParseOptions(delimiter=';', quote_char='"', double_quote=True, escape_char=False,
+                                        newlines_in_values=True, ignore_empty_lines=False)
+    try:
+        table = pa_csv.read_csv(pa.BufferReader(data),
+                                read_options=pa_csv.ReadOptions(use_threads=use_threads),
+                                parse_options=parse_options,
+                                convert_options=convert_options)
+    except pa.ArrowInvalid:
+        return None
+    return table.columns
+
+
+def read_numbers(column: Any, dtype: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert an int64 or double column read by pyarrow into NumPy numbers and a mask of the missing values."""
+    import pyarrow.compute as pc
+    # NumPy views of Arrow memory are read-only, pandas arrays have to be writable
+    data = np.array(pc.fill_null(column, 0).to_numpy(), dtype=_NUMPY_TYPES[dtype])
+    mask = np.array(pc.is_null(column).to_numpy(), dtype=bool)
+    return data, mask
+
+
+def read_categorical(column: Any) -> pd.Categorical:
+    """Dictionary-encode a string column read by pyarrow into a categorical."""
+    import pyarrow.compute as pc
+    encoded = pc.dictionary_encode(column.combine_chunks())
+    codes = pc.fill_null(encoded.indices, -1).to_numpy(zero_copy_only=False).astype(np.int32)
+    return pd.Categorical.from_codes(codes, categories=encoded.dictionary.to_pylist())
+
+
+# pylint: disable=too-many-locals
+def format_column(
+    column: pd.Series,
+    col_name: Any,
+    float_cols_set: Set[str],
+    int_cols_set: Set[str],
+    datetime_cols_set: Set[str],
+    geometry_cols_set: Set[str]
+) -> Optional[List[str]]:
+    """Format the values of an Arrow-backed column with pyarrow compute functions.
+
+    The fields are the same as those of the Cadenza CSV writer for the values one by one. Returns None
+    for columns that are not backed by Arrow and for Arrow types that pyarrow formats differently.
+    """
+    dtype = column.dtype
+    if not (isinstance(dtype, pd.ArrowDtype)
+            or (isinstance(dtype, pd.StringDtype) and dtype.storage.startswith('pyarrow'))):
+        return None
+    pa = import_pyarrow()
+    import pyarrow.compute as pc
+
+    values = pa.array(column.array)
+    arrow_type = values.type
+    kind = formatting.column_kind(col_name, int_cols_set, datetime_cols_set, geometry_cols_set)
+
+    if kind == 'datetime' and pa.types.is_timestamp(arrow_type) and arrow_type.tz in (None, 'UTC'):
+        # isoformat(timespec='seconds') truncates fractional seconds, UTC is written as Z
+        seconds = pc.floor_temporal(values, unit='second').cast(pa.timestamp('s', tz=arrow_type.tz))
+        text = pc.strftime(seconds, '%Y-%m-%dT%H:%M:%SZ' if arrow_type.tz else '%Y-%m-%dT%H:%M:%S')
+    elif kind in (None, 'int') and pa.types.is_integer(arrow_type):
+        text = values.cast(pa.string())
+    elif kind is None and pa.types.is_float64(arrow_type):
+        # pyarrow writes floats differently than str(), e.g. 1e+16 as 10000000000000000, NumPy does not
+        text = pa.array(values.to_numpy(zero_copy_only=False).astype(str))
+    elif kind is None and (pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)):
+        text = pc.replace_substring(values, '"', '""')
+    else:
+        return None
+
+    quote = pa.scalar('"', pa.large_string())
+    quoted = pc.binary_join_element_wise(quote, text.cast(pa.large_string()), quote, pa.scalar('', pa.large_string()))
+    missing = pc.is_null(values, nan_is_null=True)
+    return pc.if_else(missing, '"NaN"' if col_name and col_name in float_cols_set else '', quoted).to_pylist()
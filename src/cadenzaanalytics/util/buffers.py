@@ -0,0 +1,141 @@
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from cadenzaanalytics.data.dtype_backend import DtypeBackend
+from cadenzaanalytics.util import arrow, stats
+
+NUMPY_TYPES = {"Int64": np.int64, "Float64": np.float64}
+# Integer types that the values of Int64 columns are downcast to, from the narrowest
+_INTEGER_TYPES = (np.int8, np.int16, np.int32)
+
+_Token = Optional[Union[str, bytes]]
+
+
+class NumberColumn:
+    """Values of an Int64 or Float64 column, converted block by block into NumPy arrays and null masks."""
+
+    def __init__(self, dtype: str, collect_stats: bool = False) -> None:
+        self._dtype = dtype
+        self._data = []
+        self._masks = []
+        self.stats = stats.StatsCollector() if collect_stats else None
+
+    def extend(self, values: Sequence[_Token]) -> None:
+        data, mask = _parse_numbers(values, self._dtype)
+        self._data.append(data)
+        self._masks.append(mask)
+        if self.stats is not None:
+            self.stats.add_numbers(data, mask)
+
+    # pylint: disable=protected-access
+    def merge(self, other: "NumberColumn") -> None:
+        self._data.extend(other._data)
+        self._masks.extend(other._masks)
+        if self.stats is not None:
+            self.stats.merge(other.stats)
+
+    def to_array(self,
+                 dtype_backend: DtypeBackend = DtypeBackend.NUMPY_NULLABLE,
+                 downcast: bool = False) -> Union[pd.api.extensions.ExtensionArray, np.ndarray]:
+        data = np.concatenate(self._data) if self._data else np.empty(0, dtype=NUMPY_TYPES[self._dtype])
+        mask = np.concatenate(self._masks) if self._masks else np.empty(0, dtype=bool)
+        self._data = self._masks = None
+        return number_array(data, mask, self._dtype, dtype_backend, downcast)
+
+
+def number_array(data: np.ndarray,
+                 mask: np.ndarray,
+                 dtype: str,
+                 dtype_backend: DtypeBackend,
+                 downcast: bool = False) -> Union[pd.api.extensions.ExtensionArray, np.ndarray]:
+    """Convert numbers and a mask of the missing values into an Int64 or Float64 array of the dtype backend.
+
+    With downcast, integers are stored in the narrowest integer type that holds all of them, and floats as
+    float32 if all of them are exactly representable as float32. Columns of NumPy-backed dtypes without
+    missing values are then plain NumPy arrays. With `DtypeBackend.NUMPY`, missing floats are NaN and
+    only integer columns with missing values are Int64 arrays.
+    """
+    if downcast:
+        data = _downcast(data, mask)
+    if dtype_backend == DtypeBackend.PYARROW:
+        return arrow.masked_array(data, mask)
+    if dtype_backend == DtypeBackend.NUMPY and dtype == "Float64":
+        data[mask] = np.nan
+        return data
+    if (downcast or dtype_backend == DtypeBackend.NUMPY) and not mask.any():
+        return data
+    if dtype == "Int64":
+        return pd.arrays.IntegerArray(data, mask)
+    return pd.arrays.FloatingArray(data, mask)
+
+
+def _downcast(data: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    values = data[~mask]
+    if data.dtype.kind == 'i':
+        low, high = (values.min(), values.max()) if len(values) > 0 else (0, 0)
+        for integer_type in _INTEGER_TYPES:
+            info = np.iinfo(integer_type)
+            if info.min <= low and high <= info.max:
+                return data.astype(integer_type)
+        return data
+    with np.errstate(over='ignore'):
+        narrow = data.astype(np.float32)
+    # NaN values stay NaN, all other values have to be unchanged by the round trip through float32
+    if np.array_equal(narrow[~mask], values, equal_nan=True):
+        return narrow
+    return data
+
+
+class CategoryColumn:
+    """Values of a text column, dictionary-encoded block by block into the codes of a categorical."""
+
+    def __init__(self) -> None:
+        self._codes_by_value = {}
+        self._codes = []
+
+    def extend(self, values: Sequence[_Token]) -> None:
+        block_codes, block_values = pd.factorize(np.array(values, dtype=object))
+        codes_by_value = self._codes_by_value
+        codes = [codes_by_value.setdefault(value, len(codes_by_value)) for value in block_values]
+        # missing values have the block code -1, which picks the appended -1
+        self._codes.append(np.array(codes + [-1], dtype=np.int32)[block_codes])
+
+    # pylint: disable=protected-access
+    def merge(self, other: "CategoryColumn") -> None:
+        # the values of the other column get the codes of this column, new values are appended
+        codes_by_value = self._codes_by_value
+        codes = [codes_by_value.setdefault(value, len(codes_by_value)) for value in other._codes_by_value]
+        mapping = np.array(codes + [-1], dtype=np.int32)
+        self._codes.extend(mapping[other_codes] for other_codes in other._codes)
+
+    def to_array(self) -> pd.Categorical:
+        codes = np.concatenate(self._codes) if self._codes else np.empty(0, dtype=np.int32)
+        # only the distinct values are decoded if the values are bytes
+        categories = decode(list(self._codes_by_value))
+        self._codes = self._codes_by_value = None
+        return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _parse_numbers(values: Sequence[_Token], dtype: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse text or UTF-8 encoded numbers into a NumPy array and a mask of the missing values."""
+    numpy_type = NUMPY_TYPES[dtype]
+    tokens = np.array(values, dtype=object)
+    mask = np.equal(tokens, None)
+    tokens[mask] = 0
+    try:
+        # converts each value with int() or float(), which accept str as well as bytes
+        return tokens.astype(numpy_type), mask
+    except (ValueError, TypeError, OverflowError):
+        pass
+    # let pandas convert or reject values the built-in conversion does not accept, e.g. non-ASCII digits
+    array = pd.array(np.array([value.decode('UTF-8') if isinstance(value, bytes) else value for value in values],
+                              dtype=object),
+                     dtype=dtype)
+    return array.to_numpy(dtype=numpy_type, na_value=0), np.asarray(array.isna())
+
+
+def decode(values: Sequence[_Token]) -> List[Optional[str]]:
+    """Decode UTF-8 encoded values, text and None are kept as they are."""
+    return [value.decode('UTF-8') if isinstance(value, bytes) else value for value in values]
@@ -1,18 +1,60 @@
 import csv
+import gc
+import mmap
+import os
+import re
 import sys
-from io import StringIO
-from typing import Dict, List, Optional
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from io import StringIO, TextIOWrapper
+from itertools import chain, islice
+from operator import itemgetter
+from typing import (Any, AnyStr, BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Pattern,
+                    Set, Tuple, Union)
 
 import numpy as np
 import pandas as pd
-from shapely import from_wkt, to_wkt
+from shapely import from_wkt
 
+from cadenzaanalytics.data.dtype_backend import DtypeBackend
+from cadenzaanalytics.data.column_stats import ColumnStats
+from cadenzaanalytics.util import arrow, buffers, datetimes, records, stats
+# the writer is imported from here by existing code
+from cadenzaanalytics.util.writer import CHUNK_ROWS, iter_cadenza_csv, to_cadenza_csv  # pylint: disable=unused-import
 
+# Approximate number of characters (or bytes read from a stream) and number of rows that are
+# tokenized and transposed at once
+_BLOCK_SIZE = 1 << 20
+_BLOCK_ROWS = 10000
+# Default number of values of a column below which the column is converted on the calling thread only
+PARALLEL_THRESHOLD = 50000
+# Default size in bytes of CSV data below which it is parsed by the Python parser even if pyarrow is installed
+PYARROW_THRESHOLD = 1 << 20
+
+CsvSource = Union[str, bytes, bytearray, memoryview, mmap.mmap, BinaryIO]
+_BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+_Token = Optional[Union[str, bytes]]
+_Row = List[_Token]
+_Rows = List[_Row]
+_ColumnBuffer = Union[List[_Token], buffers.NumberColumn, buffers.CategoryColumn]
+
+
+# pylint: disable=too-many-arguments
 def from_cadenza_csv(
-    csv_data: str,
+    csv_data: CsvSource,
     type_mapping: Optional[Dict[str, str]] = None,
     datetime_columns: Optional[List[str]] = None,
-    geometry_columns: Optional[List[str]] = None
+    geometry_columns: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    parallel_threshold: int = PARALLEL_THRESHOLD,
+    columns: Optional[List[str]] = None,
+    categorical_columns: Optional[List[str]] = None,
+    dtype_backend: DtypeBackend = DtypeBackend.NUMPY_NULLABLE,
+    pyarrow_threshold: Optional[int] = PYARROW_THRESHOLD,
+    executor: Optional[Executor] = None,
+    downcast_numbers: bool = False
 ) -> pd.DataFrame:
     """Parse Cadenza CSV format into a pandas DataFrame.
 
@@ -28,280 +70,774 @@ def from_cadenza_csv(
 
     Parameters
     ----------
-    csv_data : str
-        The CSV data as a string
+    csv_data : Union[str, bytes, bytearray, memoryview, mmap.mmap, BinaryIO]
+        The CSV data as a string, or UTF-8 encoded CSV data as a bytes-like object, e.g. a memory-mapped
+        file, or as a binary stream which is read and parsed in chunks, e.g. the stream of an uploaded
+        file. Binary data is tokenized without decoding it first, only values of text columns are decoded.
     type_mapping : Optional[Dict[str, type]]
         Optional mapping of column names to pandas dtypes
     datetime_columns : Optional[List[str]]
         List of column names to parse as ISO8601 datetimes
     geometry_columns : Optional[List[str]]
         List of column names to parse as WKT geometries
+    max_workers : Optional[int]
+        Maximum number of threads that convert large columns, and the values of a large column, in
+        parallel, defaults to the number of CPUs. With 1, all values are converted on the calling thread.
+    parallel_threshold : int
+        Minimum number of values of a column for it to be converted in parallel with other columns and
+        in chunks
+    columns : Optional[List[str]]
+        Names of the columns to parse, the values of all other columns are dropped right after
+        tokenizing. Defaults to all columns. Names that are not in the data are ignored.
+    categorical_columns : Optional[List[str]]
+        List of column names to parse as pandas Categorical, e.g. text columns with few distinct values.
+        Their values are dictionary-encoded while parsing, so that each distinct value is held only once.
+    dtype_backend : DtypeBackend
+        The dtypes of the parsed Int64, Float64, string and datetime columns. With `DtypeBackend.PYARROW`
+        they are parsed into Arrow-backed columns, which requires pyarrow. With `DtypeBackend.NUMPY`,
+        Float64 columns are parsed into float64 with NaN for missing values, Int64 columns without missing
+        values into int64 and string columns into object arrays. Geometry and categorical columns are not
+        affected.
+    pyarrow_threshold : Optional[int]
+        Minimum size of the CSV data in bytes (in characters for a string) for it to be parsed by the
+        multithreaded CSV reader of pyarrow, if pyarrow is installed. Streams and data that pyarrow
+        cannot read exactly like the Python parser, e.g. rows with missing values at their end, are parsed
+        by the Python parser. With None, all data is parsed by the Python parser.
+    executor : Optional[Executor]
+        Executor on which the Python parser parses segments of large CSV data in parallel, e.g. a
+        ProcessPoolExecutor. The data is split into max_workers segments of whole records, each at least
+        about 1 MiB. Defaults to a thread pool of max_workers threads if the interpreter runs without the
+        global interpreter lock, otherwise the data is parsed on the calling thread. Streams and data with
+        unquoted values are always parsed on the calling thread.
+    downcast_numbers : bool
+        Whether Int64 and Float64 columns are stored in the narrowest type that holds their values, i.e.
+        int8, int16 or int32 for the range of an integer column and float32 if all values of a float column
+        are exactly representable as float32. Columns without missing values then have plain NumPy dtypes
+        unless the dtype backend is pyarrow.
 
     Returns
     -------
     pd.DataFrame
         Parsed dataframe with proper None values for unquoted fields
     """
-    if not csv_data or not csv_data.strip():
-        return pd.DataFrame()
+    return parse_cadenza_csv(csv_data,
+                             type_mapping=type_mapping,
+                             datetime_columns=datetime_columns,
+                             geometry_columns=geometry_columns,
+                             max_workers=max_workers,
+                             parallel_threshold=parallel_threshold,
+                             columns=columns,
+                             categorical_columns=categorical_columns,
+                             dtype_backend=dtype_backend,
+                             pyarrow_threshold=pyarrow_threshold,
+                             executor=executor,
+                             downcast_numbers=downcast_numbers).to_frame()
+
+
+# pylint: disable=too-many-locals,too-many-arguments,too-many-branches
+def parse_cadenza_csv(
+    csv_data: CsvSource,
+    type_mapping: Optional[Dict[str, str]] = None,
+    datetime_columns: Optional[List[str]] = None,
+    geometry_columns: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    parallel_threshold: int = PARALLEL_THRESHOLD,
+    columns: Optional[List[str]] = None,
+    categorical_columns: Optional[List[str]] = None,
+    dtype_backend: DtypeBackend = DtypeBackend.NUMPY_NULLABLE,
+    pyarrow_threshold: Optional[int] = PYARROW_THRESHOLD,
+    executor: Optional[Executor] = None,
+    collect_stats: bool = False,
+    downcast_numbers: bool = False
+) -> "CsvColumns":
+    """Parse Cadenza CSV format into columns that are converted to their types when first read.
+
+    Takes the same parameters as `from_cadenza_csv`. Int64 and Float64 columns are converted while
+    parsing, all other columns keep their parsed values until they are read from the result.
+
+    Parameters
+    ----------
+    collect_stats : bool
+        Whether the statistics of the columns are collected while they are parsed and converted,
+        see `CsvColumns.stats`. The statistics of Int64 and Float64 columns are collected block by
+        block while parsing.
+
+    Returns
+    -------
+    CsvColumns
+        The parsed columns
+    """
+    if isinstance(csv_data, str) and (not csv_data or csv_data.isspace()):
+        return CsvColumns([], [], [])
+    if dtype_backend == DtypeBackend.PYARROW:
+        arrow.import_pyarrow()
+
+    datetime_columns = set(datetime_columns or [])
+    geometry_columns = set(geometry_columns or [])
+    type_mapping = type_mapping or {}
+    max_workers = max_workers or os.cpu_count() or 1
+    binary = not isinstance(csv_data, str) and not _uses_default_reader(csv_data)
+    # numeric columns are converted block by block while parsing, their values are never collected
+    number_types = {column: dtype for column, dtype in type_mapping.items()
+                    if dtype in buffers.NUMPY_TYPES and column not in datetime_columns | geometry_columns}
+    categorical_columns = (set(categorical_columns or []) - datetime_columns - geometry_columns
+                           - number_types.keys())
+    selected_columns = None if columns is None else set(columns)
+
+    parsed = None
+    if _uses_pyarrow(csv_data, pyarrow_threshold):
+        parsed = _read_with_pyarrow(csv_data, number_types, selected_columns, use_threads=max_workers > 1)
+    from_arrow = parsed is not None
+    if not from_arrow:
+        # the parse allocates millions of small objects which are never part of reference cycles,
+        # the cyclic garbage collector would repeatedly traverse all of them without freeing anything
+        with _gc_paused():
+            segments = _split_segments(csv_data, max_workers, executor)
+            if segments is not None:
+                # segments are parsed as bytes, even those of a string
+                binary = True
+                parsed = _parse_segments(*segments, executor, number_types, selected_columns, categorical_columns,
+                                         collect_stats)
+            else:
+                parsed = _parse_columns(_iter_row_blocks(csv_data), number_types, selected_columns,
+                                        categorical_columns, collect_stats)
+    if parsed is None:
+        return CsvColumns([], [], [])
+    headers, values = parsed
+
+    converters = []
+    column_stats = [None] * len(headers) if collect_stats else None
+    for i, header in enumerate(headers):
+        options = {"dtype": type_mapping.get(header),
+                   "is_datetime": header in datetime_columns,
+                   "is_geometry": header in geometry_columns,
+                   "max_workers": max_workers,
+                   "parallel_threshold": parallel_threshold,
+                   "dtype_backend": dtype_backend}
+        if from_arrow and header in number_types:
+            values[i] = _read_arrow_numbers(values[i], number_types[header], dtype_backend, downcast_numbers)
+            converters.append(None)
+        elif from_arrow and header in categorical_columns:
+            values[i] = arrow.read_categorical(values[i])
+            converters.append(None)
+        elif from_arrow:
+            converters.append(partial(_convert_arrow_column, **options))
+        elif isinstance(values[i], buffers.NumberColumn):
+            # with the NumPy backend, "NaN" floats become missing values, which the statistics collected
+            # while parsing count as present, so that they are collected from the array below instead
+            if collect_stats and not (dtype_backend == DtypeBackend.NUMPY and number_types[header] == "Float64"):
+                column_stats[i] = values[i].stats.to_stats()
+            values[i] = values[i].to_array(dtype_backend, downcast_numbers)
+            converters.append(None)
+        elif isinstance(values[i], buffers.CategoryColumn):
+            values[i] = values[i].to_array()
+            converters.append(None)
+        else:
+            converters.append(partial(_convert_column, binary=binary, **options))
+        if collect_stats and converters[i] is None and column_stats[i] is None:
+            column_stats[i] = _array_stats(values[i])
+    return CsvColumns(headers, values, converters, max_workers, parallel_threshold, column_stats)
 
-    all_rows =  _parse_csv_with_default_reader(csv_data) \
-        if sys.version_info >= (3, 13) \
-        else _parse_csv(csv_data)
 
-    if not all_rows:
-        return pd.DataFrame()
+class CsvColumns:
+    """Columns of parsed Cadenza CSV data, each of which is converted to its type when it is first read.
 
-    # First row is headers
-    headers = all_rows[0]
-    parsed_rows = all_rows[1:]
+    Until then, a column holds its parsed values. Converted columns replace these values, so that
+    every column is converted at most once. Columns of at least parallel_threshold rows that are read
+    at once are converted on a thread pool of up to max_workers threads, one task per column. Columns
+    that are parsed in chunks then use their share of max_workers for the chunks.
+    """
 
-    # Create DataFrame, use dtype=object to preserve None values (behavior changes with
-    # pandas 3.0.0 where None values without a specified dtype result in <NA> values
-    # and a specific dtype is chosen depending on other values in the column)
-    df = pd.DataFrame(parsed_rows, columns=headers, dtype=object)
+    def __init__(self,
+                 headers: List[Optional[str]],
+                 columns: List[Any],
+                 converters: List[Optional[Callable[[List[_Token]], Any]]],
+                 max_workers: int = 1,
+                 parallel_threshold: int = PARALLEL_THRESHOLD,
+                 column_stats: Optional[List[Optional[ColumnStats]]] = None) -> None:
+        self._headers = headers
+        self._columns = columns
+        self._converters = converters
+        self._max_workers = max_workers
+        self._parallel_threshold = parallel_threshold
+        self._column_stats = column_stats
+
+    @property
+    def names(self) -> List[Optional[str]]:
+        """Get the names of all columns.
+
+        Returns
+        -------
+        List[Optional[str]]
+            The column names in the order of the CSV data.
+        """
+        return list(self._headers)
+
+    @property
+    def stats(self) -> Optional[Dict[Optional[str], ColumnStats]]:
+        """Get the statistics of all columns, if they were collected while parsing.
+
+        The statistics of a column that has not been read yet are collected while it is converted,
+        so that all such columns are converted on first access.
+
+        Returns
+        -------
+        Optional[Dict[Optional[str], ColumnStats]]
+            The statistics by column name, or None if they were not collected.
+        """
+        if self._column_stats is None:
+            return None
+        self._convert_all(list(range(len(self._headers))))
+        return dict(zip(self._headers, self._column_stats))
+
+    def to_frame(self, columns: Optional[List[str]] = None, copy: bool = False) -> pd.DataFrame:
+        """Get a DataFrame of the given columns, converting those columns that have not been read yet.
+
+        Parameters
+        ----------
+        columns : Optional[List[str]]
+            The names of the columns in the order they should have in the DataFrame, defaults to all columns.
+        copy : bool
+            Whether the DataFrame gets copies of the converted values or shares them with later DataFrames.
+
+        Returns
+        -------
+        pd.DataFrame
+            The DataFrame of the columns.
+
+        Raises
+        ------
+        KeyError
+            If a column does not exist.
+        """
+        if not self._headers:
+            return pd.DataFrame()
+        if columns is None:
+            indices = list(range(len(self._headers)))
+        else:
+            indices = [i for name in columns for i in self._indices(name)]
+
+        with _gc_paused():
+            self._convert_all(indices)
+            arrays = {position: self._columns[i] for position, i in enumerate(indices)}
+        df = pd.DataFrame(arrays, copy=copy)
+        df.columns = [self._headers[i] for i in indices]
+        return df
+
+    def _indices(self, name: str) -> List[int]:
+        indices = [i for i, header in enumerate(self._headers) if header == name]
+        if not indices:
+            raise KeyError(name)
+        return indices
+
+    def _convert_all(self, indices: List[int]) -> None:
+        pending = [i for i in dict.fromkeys(indices) if self._converters[i] is not None]
+        if (self._max_workers > 1 and len(pending) > 1
+                and len(self._columns[pending[0]]) >= self._parallel_threshold):
+            # the conversions are independent and mostly release the GIL, each task replaces only its own column
+            workers = min(self._max_workers, len(pending))
+            # the threads that convert chunks of a column share max_workers with the threads of the columns
+            convert = partial(self._convert, max_workers=max(self._max_workers // workers, 1))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(convert, pending))
+        else:
+            for index in pending:
+                self._convert(index)
+
+    def _convert(self, index: int, max_workers: Optional[int] = None) -> None:
+        # release the parsed values right away, so that only the columns being converted are held twice
+        options = {} if max_workers is None else {"max_workers": max_workers}
+        self._columns[index] = self._converters[index](self._columns[index], **options)
+        self._converters[index] = None
+        if self._column_stats is not None:
+            self._column_stats[index] = _array_stats(self._columns[index])
+
+
+def _convert_column(values: List[_Token],
+                    dtype: Optional[str],
+                    is_datetime: bool,
+                    is_geometry: bool,
+                    binary: bool,
+                    max_workers: int = 1,
+                    parallel_threshold: int = PARALLEL_THRESHOLD,
+                    dtype_backend: DtypeBackend = DtypeBackend.NUMPY_NULLABLE):
+    """Convert the parsed values of a column, which are UTF-8 encoded bytes if binary is set."""
+    if is_geometry:
+        # Parse WKT geometries into shapely geometry objects, shapely reads WKT from bytes as well
+        # and releases the GIL while parsing, so that chunks of large columns are parsed in parallel
+        return _map_chunks(partial(from_wkt, on_invalid='warn'),
+                           np.array(values, dtype=object),
+                           max_workers,
+                           parallel_threshold)
+    if is_datetime:
+        if binary:
+            values = buffers.decode(values)
+        if dtype_backend == DtypeBackend.PYARROW:
+            return arrow.timestamp_array(datetimes.parse_datetimes(values))
+        return datetimes.parse_datetimes(values)
+    if dtype == "string" and dtype_backend == DtypeBackend.PYARROW:
+        return arrow.string_array(values, binary)
+    if binary:
+        values = buffers.decode(values)
+    # Use dtype=object to preserve None values (behavior changes with pandas 3.0.0 where
+    # None values without a specified dtype result in <NA> values and a specific dtype is
+    # chosen depending on other values in the column)
+    values = np.array(values, dtype=object)
+    if dtype is not None and not (dtype == "string" and dtype_backend == DtypeBackend.NUMPY):
+        return pd.array(values, dtype=dtype)
+    return values
+
+
+def _array_stats(values: Any) -> ColumnStats:
+    collector = stats.StatsCollector()
+    collector.add_array(values)
+    return collector.to_stats()
+
+
+def _map_chunks(function: Callable[[np.ndarray], np.ndarray],
+                values: np.ndarray,
+                max_workers: int,
+                parallel_threshold: int) -> np.ndarray:
+    """Apply a vectorized function that releases the GIL to chunks of the values on a thread pool.
+
+    Values fewer than parallel_threshold are passed to the function as a whole on the calling thread.
+    """
+    if max_workers <= 1 or len(values) < parallel_threshold:
+        return function(values)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return np.concatenate(list(executor.map(function, np.array_split(values, max_workers))))
+
+
+@contextmanager
+def _gc_paused():
+    """Disable the cyclic garbage collector for the duration of the context."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _parse_columns(
+    row_blocks: Iterable[_Rows],
+    number_types: Dict[str, str],
+    selected_columns: Optional[Set[str]] = None,
+    categorical_columns: Optional[Set[str]] = None,
+    collect_stats: bool = False
+) -> Optional[Tuple[List[Optional[str]], List[_ColumnBuffer]]]:
+    """Collect blocks of parsed rows into per-column buffers.
+
+    The first row holds the headers, which are decoded if the rows are binary. Each block is
+    transposed as a whole and appended to the column buffers, so that rows only exist for the
+    duration of a single block. Rows with fewer values than headers are filled up with None.
+    Columns listed in number_types are converted into numbers and categorical_columns are
+    dictionary-encoded block by block, collecting their statistics if collect_stats is set. If
+    selected_columns are given, the values of all other columns are dropped with their block.
+
+    Returns the headers and the buffer of each selected column, or None if there are no rows at all.
+    """
+    headers = None
+    indices = []
+    columns = []
+    for block in row_blocks:
+        if headers is None:
+            if not block:
+                continue
+            headers = buffers.decode(block[0])
+            indices = [i for i, header in enumerate(headers)
+                       if selected_columns is None or header in selected_columns]
+            columns = [_new_column_buffer(headers[i], number_types, categorical_columns or set(), collect_stats)
+                       for i in indices]
+            block = block[1:]
+
+        width = len(headers)
+        for row in block:
+            if len(row) != width:
+                if len(row) > width:
+                    raise ValueError(f"{width} columns passed, passed data had {len(row)} columns")
+                row.extend([None] * (width - len(row)))
+
+        if len(indices) == width:
+            for column, values in zip(columns, zip(*block)):
+                column.extend(values)
+        else:
+            # only pick the selected values instead of transposing the whole block
+            for column, index in zip(columns, indices):
+                column.extend(list(map(itemgetter(index), block)))
+
+    if headers is None:
+        return None
+    return [headers[i] for i in indices], columns
 
-    # Apply type mappings if provided
-    if type_mapping:
-        for col, dtype in type_mapping.items():
-            if col in df.columns:
-                df[col] = df[col].astype(dtype)
 
-    # Parse datetime columns
-    if datetime_columns:
-        for col in datetime_columns:
-            if col in df.columns:
-                # Parse without format specification to handle various ISO8601 timezone formats
-                df[col] = pd.to_datetime(df[col], errors='coerce', utc=True)
+def _new_column_buffer(header: Optional[str],
+                       number_types: Dict[str, str],
+                       categorical_columns: Set[str],
+                       collect_stats: bool = False) -> _ColumnBuffer:
+    if header in number_types:
+        return buffers.NumberColumn(number_types[header], collect_stats)
+    if header in categorical_columns:
+        return buffers.CategoryColumn()
+    return []
 
-    # Parse WKT geometries into shapely geometry objects
-    if geometry_columns:
-        for col in geometry_columns:
-            if col in df.columns:
-                values = df[col].to_numpy()
-                df[col] = from_wkt(values, on_invalid='warn')
 
-    return df
+def _read_header(data: Union[bytes, bytearray, memoryview, mmap.mmap]) -> Optional[Tuple[_Row, int]]:
+    """Parse the header of binary CSV data, returns None if it does not end within the first block."""
+    return _parse_record(bytes(data[:_BLOCK_SIZE]), 0, len(data) <= _BLOCK_SIZE, _BYTES_SYMBOLS)
 
 
-def _parse_csv_with_default_reader(csv_data: str) -> List[str]:
+def _split_segments(source: CsvSource,
+                    max_workers: int,
+                    executor: Optional[Executor]) -> Optional[Tuple[_Row, List[bytes]]]:
+    """Split CSV data into its header and segments of whole records, which are parsed independently.
+
+    Returns None if the data is parsed on the calling thread, see `from_cadenza_csv`.
+    """
+    if executor is None and _gil_enabled():
+        return None
+    if not isinstance(source, (str,) + _BUFFER_TYPES):
+        return None
+    data = source.encode('UTF-8') if isinstance(source, str) else source
+    count = min(max_workers, len(data) // _BLOCK_SIZE)
+    if count < 2:
+        return None
+    header = _read_header(data)
+    if header is None:
+        return None
+    array = np.frombuffer(data, dtype=np.uint8)
+    # a record can only be told apart by the quotes before it if all values are quoted
+    if records.has_unquoted_values(array[max(header[1] - 1, 0):]):
+        return None
+    offsets = records.split_records(array, header[1], count)
+    return header[0], [bytes(data[start:end]) for start, end in zip(offsets, offsets[1:])]
+
+
+def _gil_enabled() -> bool:
+    return getattr(sys, '_is_gil_enabled', lambda: True)()
+
+
+def _parse_segments(
+    header: _Row,
+    segments: List[bytes],
+    executor: Optional[Executor],
+    number_types: Dict[str, str],
+    selected_columns: Optional[Set[str]],
+    categorical_columns: Set[str],
+    collect_stats: bool = False
+) -> Tuple[List[Optional[str]], List[_ColumnBuffer]]:
+    """Parse segments of records in parallel and concatenate their columns in order."""
+    parse = partial(_parse_segment, header=header, number_types=number_types, selected_columns=selected_columns,
+                    categorical_columns=categorical_columns, collect_stats=collect_stats)
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=len(segments)) as own_executor:
+            results = list(own_executor.map(parse, segments))
+    else:
+        results = list(executor.map(parse, segments))
+
+    headers, columns = results[0]
+    for _, segment_columns in results[1:]:
+        for column, segment_column in zip(columns, segment_columns):
+            if isinstance(column, list):
+                column.extend(segment_column)
+            else:
+                column.merge(segment_column)
+    return headers, columns
+
+
+def _parse_segment(
+    segment: bytes,
+    header: _Row,
+    number_types: Dict[str, str],
+    selected_columns: Optional[Set[str]],
+    categorical_columns: Set[str],
+    collect_stats: bool = False
+) -> Tuple[List[Optional[str]], List[_ColumnBuffer]]:
+    """Parse the records of a segment into column buffers, as if they followed the header."""
+    with _gc_paused():
+        return _parse_columns(chain([[list(header)]], _parse_chunks(_slice_chunks(segment))),
+                              number_types, selected_columns, categorical_columns, collect_stats)
+
+
+def _uses_pyarrow(source: CsvSource, pyarrow_threshold: Optional[int]) -> bool:
+    return (pyarrow_threshold is not None
+            and isinstance(source, (str,) + _BUFFER_TYPES)
+            and len(source) >= pyarrow_threshold
+            and arrow.optional_pyarrow() is not None)
+
+
+def _read_with_pyarrow(source: Union[str, bytes, bytearray, memoryview, mmap.mmap],
+                       number_types: Dict[str, str],
+                       selected_columns: Optional[Set[str]],
+                       use_threads: bool) -> Optional[Tuple[List[str], List[Any]]]:
+    """Read the columns of CSV data with the CSV reader of pyarrow, see `arrow.read_csv`.
+
+    Returns None if the data cannot be read exactly like the Python parser reads it, i.e. if it has
+    duplicate or missing column names, unquoted values that are not empty, characters after closing
+    quotes, line breaks other than CRLF outside of quoted values, line breaks within quoted values, a
+    semicolon at its very end or values that may be hexadecimal integers, or if pyarrow rejects it.
+    """
+    data = source.encode('UTF-8') if isinstance(source, str) else source
+    header = _read_header(data)
+    if header is None or None in header[0] or len(set(header[0])) < len(header[0]):
+        return None
+    names, header_end = buffers.decode(header[0]), header[1]
+    # pyarrow reads a semicolon at the very end of the data as followed by an empty string, not by null
+    if bytes(data[-1:]) == b';':
+        return None
+    values = np.frombuffer(data, dtype=np.uint8)[max(header_end - 1, 0):]
+    if records.has_unquoted_values(values):
+        return None
+    # pyarrow drops the LF of a quoted CRLF whose CR ends one of the blocks it reads
+    if records.has_quoted_line_breaks(values):
+        return None
+    # int() rejects hexadecimal integers, which pyarrow reads
+    if "Int64" in number_types.values() and records.has_hex_prefixes(values):
+        return None
+
+    headers = [name for name in names if selected_columns is None or name in selected_columns]
+    columns = arrow.read_csv(data, headers, number_types, use_threads)
+    if columns is None:
+        return None
+    return headers, columns
+
+
+def _read_arrow_numbers(column: Any,
+                        dtype: str,
+                        dtype_backend: DtypeBackend,
+                        downcast: bool) -> Union[pd.api.extensions.ExtensionArray, np.ndarray]:
+    if dtype_backend == DtypeBackend.PYARROW and not downcast:
+        # the array shares the memory of the column
+        return pd.arrays.ArrowExtensionArray(column)
+    return buffers.number_array(*arrow.read_numbers(column, dtype), dtype, dtype_backend, downcast)
+
+
+def _convert_arrow_column(column: Any,
+                          dtype: Optional[str],
+                          is_datetime: bool,
+                          is_geometry: bool,
+                          max_workers: int = 1,
+                          parallel_threshold: int = PARALLEL_THRESHOLD,
+                          dtype_backend: DtypeBackend = DtypeBackend.NUMPY_NULLABLE):
+    """Convert a string column read by pyarrow like the values of the Python parser."""
+    if dtype == "string" and dtype_backend == DtypeBackend.PYARROW and not (is_datetime or is_geometry):
+        return pd.arrays.ArrowStringArray(column)
+    return _convert_column(column.to_numpy(), dtype, is_datetime, is_geometry, False,
+                           max_workers, parallel_threshold, dtype_backend)
+
+
+def _iter_row_blocks(source: CsvSource) -> Iterator[_Rows]:
+    if _uses_default_reader(source):
+        return _read_row_blocks_with_default_reader(source)
+    return _parse_chunks(_iter_chunks(source))
+
+
+def _uses_default_reader(source: CsvSource) -> bool:
+    # binary buffers are always tokenized at byte level, the csv reader would require them decoded
+    return sys.version_info >= (3, 13) and not isinstance(source, _BUFFER_TYPES)
+
+
+def _read_row_blocks_with_default_reader(source: Union[str, BinaryIO]) -> Iterator[_Rows]:
     # QUOTE_NOTNULL was only fixed for Python 3.13+ in the csv reader
     # see https://github.com/python/cpython/issues/113732
-    all_rows = []
     class CadenzaDialect(csv.excel):
         delimiter = ';'
         quotechar = '"'
         doublequote = True
         lineterminator = '\r\n'
-        quoting = csv.QUOTE_NOTNULL
+        quoting = csv.QUOTE_NOTNULL  # pylint: disable=no-member
         skipinitialspace = False
 
-    reader = csv.reader(StringIO(csv_data), dialect=CadenzaDialect)
-
-    for row in reader:
-        all_rows.append(row)
-    return all_rows
+    if isinstance(source, str):
+        text_stream = StringIO(source)
+    else:
+        # the csv reader requires lines, which the wrapper reads lazily from the binary stream
+        text_stream = TextIOWrapper(source, encoding='UTF-8', newline='')
+    try:
+        reader = csv.reader(_unless_blank(text_stream), dialect=CadenzaDialect)
+
+        while True:
+            block = list(islice(reader, _BLOCK_ROWS))
+            if not block:
+                return
+            yield block
+    finally:
+        if isinstance(text_stream, TextIOWrapper):
+            # do not close the underlying stream together with the wrapper
+            text_stream.detach()
+
+
+def _iter_chunks(source: CsvSource) -> Iterator[Union[str, bytes]]:
+    """Split the CSV source into chunks of roughly `_BLOCK_SIZE` characters or bytes.
+
+    Binary sources are not decoded, their chunks are UTF-8 encoded bytes. Chunks of strings,
+    bytes and memory-mapped files end with a CRLF where possible, chunks of streams and
+    memoryviews may end anywhere, even within a value or a multi-byte character.
+    """
+    if isinstance(source, str):
+        # blank strings are already handled by from_cadenza_csv
+        return _slice_chunks(source)
+    if isinstance(source, _BUFFER_TYPES):
+        return _unless_blank(_slice_chunks(source))
+    return _unless_blank(iter(partial(source.read, _BLOCK_SIZE), b''))
+
+
+def _slice_chunks(source: Union[str, bytes, bytearray, memoryview, mmap.mmap]) -> Iterator[Union[str, bytes]]:
+    end = len(source)
+    find = getattr(source, 'find', None)
+    crlf = '\r\n' if isinstance(source, str) else b'\r\n'
+    start = 0
+    while start < end:
+        if find is None:
+            chunk_end = min(start + _BLOCK_SIZE, end)
+        else:
+            chunk_end = find(crlf, start + _BLOCK_SIZE)
+            chunk_end = end if chunk_end == -1 else chunk_end + 2
+        chunk = source[start:chunk_end]
+        # slices of a memoryview are copied, so that no buffer stays exported after parsing,
+        # and mutable slices become bytes, which the tokenizer expects of binary data
+        yield bytes(chunk) if isinstance(chunk, (memoryview, bytearray)) else chunk
+        start = chunk_end
+
+
+def _unless_blank(chunks: Iterable[AnyStr]) -> Iterator[AnyStr]:
+    """Pass the chunks through, unless all of them together are only whitespace."""
+    chunks = iter(chunks)
+    blank = []
+    for chunk in chunks:
+        if not chunk or chunk.isspace():
+            blank.append(chunk)
+        else:
+            yield from blank
+            yield chunk
+            yield from chunks
+            return
 
-# pylint: disable=too-many-branches,too-many-nested-blocks,too-many-locals
-def _parse_csv(csv_data: str):
-    """Parse entire CSV data respecting quoted fields with embedded newlines.
 
-    Returns list of rows, where each row is a list of values.
-    """
-    rows = []
-    pos = 0
-
-    while pos < len(csv_data):
-        row = []
-        last_was_semicolon = False
-
-        # Parse one row (until we hit CRLF that's not inside a quoted field)
-        while pos < len(csv_data):
-            # Check for row terminator first
-            if csv_data[pos:pos+2] == '\r\n':
-                # If last character before CRLF was semicolon, add trailing None
-                if last_was_semicolon:
-                    row.append(None)
-                break
-
-            # Reset flag
-            last_was_semicolon = False
-
-            # Check if value is quoted
-            if csv_data[pos] == '"':
-                # Quoted value - extract content (can contain newlines)
-                pos += 1
-                value = []
-                while pos < len(csv_data):
-                    if csv_data[pos] == '"':
-                        # Check for escaped quote
-                        if pos + 1 < len(csv_data) and csv_data[pos + 1] == '"':
-                            value.append('"')
-                            pos += 2
-                        else:
-                            # End of quoted value
-                            pos += 1
-                            break
-                    else:
-                        value.append(csv_data[pos])
-                        pos += 1
-                row.append(''.join(value))
-
-                # Move past semicolon if present
-                if pos < len(csv_data) and csv_data[pos] == ';':
-                    pos += 1
-                    last_was_semicolon = True
-            elif csv_data[pos] == ';':
-                # Semicolon at current position = unquoted (None) value before it
-                row.append(None)
-                pos += 1
-                last_was_semicolon = True
-            else:
-                # Any other character at start of field = unquoted = None
-                row.append(None)
-                while pos < len(csv_data) and csv_data[pos] != ';' and csv_data[pos:pos+2] != '\r\n':
-                    pos += 1
-                if pos < len(csv_data) and csv_data[pos] == ';':
-                    pos += 1
-                    last_was_semicolon = True
+class _Symbols(NamedTuple):
+    """The characters the tokenizer looks for, as text or as UTF-8 bytes."""
+    crlf: AnyStr
+    separator: AnyStr
+    quote: AnyStr
+    quoted_separator: AnyStr
+    escaped_quote: AnyStr
+    # a single quote character as obtained by indexing, which is an int for bytes
+    quote_item: Union[str, int]
+    field_pattern: Pattern
 
-        # If we ended at EOF and last was semicolon, add trailing None
-        if pos >= len(csv_data) and last_was_semicolon:
-            row.append(None)
 
-        # Add row (even if empty - empty row means single None value)
-        if row or (pos < len(csv_data) and csv_data[pos:pos+2] == '\r\n'):
-            rows.append(row if row else [None])
+# A single field followed by its terminator. Quoted fields may contain doubled quotes, semicolons
+# and line breaks; a missing closing quote consumes the rest of the data. Anything else up to the
+# next semicolon or CRLF is an unquoted (missing) value. An empty terminator only occurs at the end
+# of the data or if a quoted field is directly followed by another character.
+_FIELD_PATTERN = r'(?:"([^"]*(?:""[^"]*)*)"?|[^;\r]*(?:\r(?!\n)[^;\r]*)*)(;|\r\n|)'
 
-        # Skip CRLF
-        if pos < len(csv_data) and csv_data[pos:pos+2] == '\r\n':
-            pos += 2
+_TEXT_SYMBOLS = _Symbols('\r\n', ';', '"', '";"', '""', '"', re.compile(_FIELD_PATTERN))
+# UTF-8 continuation bytes never match ASCII characters, so the bytes can be tokenized as they are
+_BYTES_SYMBOLS = _Symbols(b'\r\n', b';', b'"', b'";"', b'""', ord('"'), re.compile(_FIELD_PATTERN.encode()))
 
-    return rows
 
+def _parse_csv(csv_data: CsvSource) -> _Rows:
+    """Parse entire CSV data respecting quoted fields with embedded newlines.
 
-def to_cadenza_csv(
-    df: pd.DataFrame,
-    datetime_columns: Optional[List[str]] = None,
-    geometry_columns: Optional[List[str]] = None,
-    float_columns: Optional[List[str]] = None,
-    int_columns: Optional[List[str]] = None
-) -> str:
-    """Convert a pandas DataFrame to Cadenza CSV format.
+    Returns list of rows, where each row is a list of values.
+    """
+    return [row for block in _parse_chunks(_iter_chunks(csv_data)) for row in block]
 
-    Cadenza CSV specs:
-    - Text encoding is UTF-8
-    - Values are separated by semicolons (;)
-    - Values enclosed by double quotes (") are considered present
-    - Values not quoted are considered None/Null/missing
-    - Numbers are decimal with dot (.) as decimal separator
-    - Lines separated by CRLF (\\r\\n)
-    - DateTimes follow ISO8601 format (e.g., 2023-01-03T15:29:13Z)
-    - Geometries are converted to WKT strings
-    - Float columns with NaN values output as the literal string "NaN" (quoted)
-    - Int columns with None values output as empty/unquoted (not "NaN")
 
-    Parameters
-    ----------
-    df : pd.DataFrame
-        The DataFrame to convert
-    datetime_columns : Optional[List[str]]
-        List of column names to format as ISO8601 datetimes
-    geometry_columns : Optional[List[str]]
-        List of column names to convert from shapely geometries to WKT
-    float_columns : Optional[List[str]]
-        List of column names that are float types (NaN will be output as "NaN")
-    int_columns : Optional[List[str]]
-        List of column names that are int types (None will be output as empty)
+def _parse_chunks(chunks: Iterable[AnyStr]) -> Iterator[_Rows]:
+    """Parse consecutive chunks of CSV text or bytes into one block of rows per chunk.
 
-    Returns
-    -------
-    str
-        CSV data as a string
+    A record that is not complete at the end of a chunk, e.g. a quoted value with line breaks
+    that continues in the next chunk, is carried over and parsed together with the next chunk.
     """
-    if df.empty and len(df.columns) == 0:
-        return ""
-
-    # Build CSV string
-    lines = []
-
-    # Write header (no special formatting for header row)
-    columns_list = df.columns.tolist()
-    lines.append(_format_row(columns_list, columns_list, None, None, None, None))
-
-    # Write data rows
-    for row in df.itertuples(index=False):
-        lines.append(_format_row(
-            row,
-            columns_list,
-            float_columns,
-            int_columns,
-            datetime_columns,
-            geometry_columns))
-
-    return '\r\n'.join(lines) + '\r\n'
-
-
-def _format_row(
-    values: List,
-    columns: List[str],
-    float_columns: Optional[List[str]] = None,
-    int_columns: Optional[List[str]] = None,
-    datetime_columns: Optional[List[str]] = None,
-    geometry_columns: Optional[List[str]] = None
-) -> str:
-    """Format a row of values according to Cadenza CSV rules.
-
-    - None/NaN/pd.NA values are unquoted for non-float types (represented as empty)
-    - For float type columns, NaN values are output as the literal string "NaN" (quoted)
-    - For int type columns, None values are explicitly output as empty (unquoted)
-    - All other values are quoted
-    - Quotes within values are escaped by doubling them
-    - Datetime values are formatted as ISO8601 strings
-    - Geometry values are converted to WKT strings
+    pending = None
+    for chunk in chunks:
+        text = pending + chunk if pending else chunk
+        rows, consumed = _parse_lines(text, final=False)
+        if rows:
+            yield rows
+        pending = text[consumed:]
+
+    if pending:
+        rows, _ = _parse_lines(pending, final=True)
+        if rows:
+            yield rows
+
+
+def _parse_lines(text: AnyStr, final: bool) -> Tuple[_Rows, int]:
+    """Parse all complete records of the text.
+
+    Lines are split in bulk and each line is split at its semicolons, or at `";"` if no value of
+    the line is missing. This is exact as long as every quote of the line belongs to a quoted
+    field that spans a whole split field, which is the case if the line holds exactly two quotes
+    per present value. Only records for which this does not hold, i.e. quoted values containing
+    a semicolon, a quote or a CRLF, are scanned with `_parse_record`.
+
+    Unless the text is the final part of the data, the text after its last CRLF is not a complete
+    record yet. Returns the parsed rows and the position of the first record that was not parsed.
     """
-    formatted_values = []
-    float_cols_set = set(float_columns) if float_columns else set()
-    int_cols_set = set(int_columns) if int_columns else set()
-    datetime_cols_set = set(datetime_columns) if datetime_columns else set()
-    geometry_cols_set = set(geometry_columns) if geometry_columns else set()
-
-    for i, value in enumerate(values):
-        col_name = columns[i] if i < len(columns) else None
-
-        # Check for None/NaN/pd.NA first (before checking column type)
-        if value is None or (isinstance(value, float) and np.isnan(value)) or pd.isna(value):
-            # For float columns, output literal "NaN"; for int/others, unquoted empty
-            if col_name and col_name in float_cols_set:
-                formatted_values.append('"NaN"')
-            else:
-                # Int columns and all other types output empty for None/NaN
-                formatted_values.append('')
-        # Handle datetime columns
-        elif col_name and col_name in datetime_cols_set:
-            # Use isoformat() and replace microseconds
-            iso_str = value.isoformat(timespec='seconds')
-            # Normalize +00:00 to Z for consistency
-            if iso_str.endswith('+00:00'):
-                iso_str = iso_str[:-6] + 'Z'
-            formatted_values.append(f'"{iso_str}"')
-        # Handle geometry columns
-        elif col_name and col_name in geometry_cols_set:
-            str_value = to_wkt(value)
-            formatted_values.append(f'"{str_value}"')
-        # Handle int columns - convert float to int if needed
-        elif col_name and col_name in int_cols_set:
-            # Convert to int first (handles case where pandas converted int to float due to None)
-            if isinstance(value, float):
-                int_value = int(value)
+    symbols = _BYTES_SYMBOLS if isinstance(text, bytes) else _TEXT_SYMBOLS
+    quote = symbols.quote
+    quote_item = symbols.quote_item
+    quoted_separator = symbols.quoted_separator
+
+    lines = text.split(symbols.crlf)
+    if not final:
+        lines.pop()
+    elif not lines[-1]:
+        # trailing CRLF is just the terminator of the last row
+        lines.pop()
+
+    rows = []
+    line_start = 0
+    next_record_start = 0
+    for line in lines:
+        if line_start >= next_record_start:
+            quotes = line.count(quote)
+            inner = line[1:-1] if line[:1] == quote and line[-1:] == quote else None
+            if inner is not None and quotes == 2 * inner.count(quoted_separator) + 2:
+                # all values are present, only the separators and the outer quotes are quotes
+                row = inner.split(quoted_separator)
             else:
-                int_value = value
-            formatted_values.append(f'"{int_value}"')
-        else:
-            # Convert to string and quote it
-            str_value = str(value)
-            # Escape quotes by doubling them
-            str_value = str_value.replace('"', '""')
-            formatted_values.append(f'"{str_value}"')
+                row = [f[1:-1] if len(f) > 1 and f[0] == quote_item and f[-1] == quote_item else None
+                       for f in line.split(symbols.separator)]
+                if quotes != 2 * (len(row) - row.count(None)):
+                    record = _parse_record(text, line_start, final, symbols)
+                    if record is None:
+                        return rows, line_start
+                    row, next_record_start = record
+            rows.append(row)
+        line_start += len(line) + 2
+
+    return rows, max(line_start, next_record_start)
 
-    return ';'.join(formatted_values)
+
+def _parse_record(text: AnyStr, pos: int, final: bool, symbols: _Symbols) -> Optional[Tuple[_Row, int]]:
+    """Parse a single record starting at pos by scanning whole fields with a regular expression.
+
+    Returns the values of the record and the position after its terminating CRLF, or None if the
+    record continues beyond the end of text that is not the final part of the data.
+    """
+    row = []
+    end = len(text)
+    match = symbols.field_pattern.match
+
+    while True:
+        field = match(text, pos)
+        value, terminator = field.groups()
+        if value is not None and symbols.quote in value:
+            value = value.replace(symbols.escaped_quote, symbols.quote)
+        row.append(value)
+        pos = field.end()
+
+        if terminator == symbols.crlf:
+            return row, pos
+        if pos >= end:
+            if not final:
+                return None
+            if terminator == symbols.separator:
+                # semicolon right before the end of the data is followed by a missing value
+                row.append(None)
+            return row, pos
@@ -0,0 +1,95 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def parse_datetimes(values: List[Optional[str]]) -> pd.api.extensions.ExtensionArray:
+    """Parse ISO8601 datetimes into UTC timestamps.
+
+    Each distinct value is parsed once. Values in the layouts Cadenza sends, i.e. with a `Z` or
+    `+hh:mm` offset and with or without seconds and fractional seconds, are parsed in bulk per
+    layout; any other values are parsed by pandas without format specification.
+    """
+    codes, uniques = pd.factorize(np.array(values, dtype=object))
+    timestamps = np.full(len(uniques), np.datetime64('NaT', 'ns'))
+    parsed = np.zeros(len(uniques), dtype=bool)
+    if len(uniques) > 0:
+        strings = uniques.astype(str)
+        lengths = np.char.str_len(strings)
+        for length in np.unique(lengths):
+            rows = np.flatnonzero(lengths == length)
+            group = strings[rows].astype(f'U{length}')
+            for suffix_length in (1, 6):
+                if length > suffix_length:
+                    _parse_iso_layout(group, suffix_length, timestamps, parsed, rows)
+
+    if not parsed.all():
+        # Parse without format specification to handle various ISO8601 timezone formats
+        others = pd.to_datetime(pd.Series(uniques[~parsed], dtype=object), errors='coerce', utc=True)
+        timestamps[~parsed] = others.dt.tz_localize(None).to_numpy(dtype='datetime64[ns]')
+
+    # missing values have the code -1
+    result = np.append(timestamps, np.datetime64('NaT', 'ns'))[codes]
+    return pd.array(result).tz_localize('UTC')
+
+
+# Positions of the separators and digits of the local part `YYYY-MM-DDThh:mm:ss.fffffffff`
+_ISO_SEPARATORS = {4: '-', 7: '-', 10: 'T', 13: ':', 16: ':', 19: '.'}
+_ISO_DIGITS = [i for i in range(29) if i not in _ISO_SEPARATORS]
+
+
+# pylint: disable=too-many-locals
+def _parse_iso_layout(group: np.ndarray, suffix_length: int,
+                      timestamps: np.ndarray, parsed: np.ndarray, rows: np.ndarray) -> None:
+    """Parse the datetimes of equal length that end with `Z` (suffix_length 1) or `+hh:mm` (suffix_length 6).
+
+    The characters of all values are compared position by position as code points. Values in the
+    layout are stored as UTC in timestamps at their rows and marked as parsed, others are skipped.
+    """
+    length = group.dtype.itemsize // 4
+    local_length = length - suffix_length
+    if local_length not in (16, 19) and not 21 <= local_length <= 29:
+        return
+    chars = group.view(np.uint32).reshape(len(group), length)
+    digits = chars[:, [i for i in _ISO_DIGITS if i < local_length]] - ord('0')
+    matches = (digits < 10).all(axis=1)
+    for position, separator in _ISO_SEPARATORS.items():
+        if position < local_length:
+            matches &= chars[:, position] == ord(separator)
+
+    # invalid dates and times as well as dates pandas cannot represent are left to pandas
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+    matches &= (year > 1677) & (year < 2262) & (month >= 1) & (month <= 12) & (day >= 1)
+    months = np.where(matches, (year.astype(np.int64) - 1970) * 12 + month - 1, 0).astype('datetime64[M]')
+    days_in_month = (months + np.timedelta64(1, 'M')).astype('datetime64[D]') - months.astype('datetime64[D]')
+    matches &= day <= days_in_month.astype(np.int64)
+    matches &= (digits[:, 8] * 10 + digits[:, 9] < 24) & (digits[:, 10] < 6)
+    if local_length > 16:
+        matches &= digits[:, 12] < 6
+
+    offsets = np.zeros(len(group), dtype='timedelta64[m]')
+    if suffix_length == 1:
+        matches &= chars[:, -1] == ord('Z')
+    else:
+        offset = chars[:, -5:].astype(np.int64) - ord('0')
+        sign = chars[:, -6]
+        matches &= ((sign == ord('+')) | (sign == ord('-'))) & (offset[:, 2] == ord(':') - ord('0'))
+        matches &= (offset[:, [0, 1, 3, 4]] >= 0).all(axis=1) & (offset[:, [0, 1, 3, 4]] < 10).all(axis=1)
+        hours = offset[:, 0] * 10 + offset[:, 1]
+        minutes = offset[:, 3] * 10 + offset[:, 4]
+        matches &= (hours < 24) & (minutes < 60)
+        offsets = np.where(sign == ord('-'), -1, 1) * (hours * 60 + minutes)
+        offsets = offsets.astype('timedelta64[m]')
+
+    if not matches.any():
+        return
+    try:
+        local = group[matches].astype(f'U{local_length}').astype('datetime64[ns]')
+    except ValueError:
+        # e.g. a day that does not exist in its month
+        return
+    timestamps[rows[matches]] = local - offsets[matches]
+    parsed[rows[matches]] = True
@@ -0,0 +1,230 @@
+from typing import Any, List, Optional, Set, Union
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from cadenzaanalytics.data.float_precision import FloatPrecision
+from cadenzaanalytics.data.geometry_precision import GeometryPrecision
+
+# Precision of the values of a float or of a geometry column
+Precision = Union[FloatPrecision, GeometryPrecision]
+
+
+def column_kind(col_name: Any,
+                int_cols_set: Set[str],
+                datetime_cols_set: Set[str],
+                geometry_cols_set: Set[str]) -> Optional[str]:
+    """Get how the values of a column are formatted: 'datetime', 'geometry', 'int' or None for their string."""
+    if col_name:
+        for cols_set, kind in ((datetime_cols_set, 'datetime'), (geometry_cols_set, 'geometry'),
+                               (int_cols_set, 'int')):
+            if col_name in cols_set:
+                return kind
+    return None
+
+
+def format_column(
+    column: pd.Series,
+    col_name: Any,
+    float_cols_set: Set[str],
+    int_cols_set: Set[str],
+    datetime_cols_set: Set[str],
+    geometry_cols_set: Set[str],
+    precision: Optional[Precision] = None
+) -> Optional[List[str]]:
+    """Format the values of a NumPy-backed column with vectorized operations.
+
+    The fields are the same as those of `format_value` for the values one by one: missing values
+    are empty, or `"NaN"` in float columns, all other values are quoted. Returns None for columns whose
+    values are formatted one by one, e.g. object columns with values other than text or geometries.
+    """
+    if isinstance(column.dtype, pd.ArrowDtype) and not (isinstance(precision, FloatPrecision)
+                                                       and pd.api.types.is_float_dtype(column.dtype)):
+        return None
+    kind = column_kind(col_name, int_cols_set, datetime_cols_set, geometry_cols_set)
+    if kind == 'datetime':
+        mask, text = _format_datetimes(column)
+    elif kind == 'geometry':
+        mask, text = _format_geometries(column, precision)
+    else:
+        mask, text = _format_scalars(column, kind == 'int', precision)
+    if text is None:
+        return None
+
+    if not mask.any():
+        return quote(text)
+    fields = np.full(len(column), '"NaN"' if col_name and col_name in float_cols_set else '', dtype=object)
+    fields[~mask] = quote(text)
+    return fields.tolist()
+
+
+def widen_floats(column: pd.Series) -> pd.Series:
+    """Cast a column of floats narrower than float64, e.g. of downcast request data, to float64.
+
+    The values are then written like those of a Float64 column, e.g. 0.1 stored as float32 is written as
+    0.10000000149011612 instead of the shortest representation of the float32 value.
+    """
+    dtype = column.dtype
+    if pd.api.types.is_float_dtype(dtype) and np.dtype(getattr(dtype, 'numpy_dtype', dtype)).itemsize < 8:
+        return column.astype(np.float64)
+    return column
+
+
+def format_value(
+    value: Any,
+    col_name: Any,
+    float_cols_set: Set[str],
+    int_cols_set: Set[str],
+    datetime_cols_set: Set[str],
+    geometry_cols_set: Set[str],
+    precision: Optional[Precision] = None
+) -> str:
+    """Format a single value of a column according to Cadenza CSV rules.
+
+    - None/NaN/pd.NA values are unquoted for non-float types (represented as empty)
+    - For float type columns, NaN values are output as the literal string "NaN" (quoted)
+    - For int type columns, None values are explicitly output as empty (unquoted)
+    - All other values are quoted
+    - Quotes within values are escaped by doubling them
+    - Datetime values are formatted as ISO8601 strings
+    - Geometry values are converted to WKT strings, with the given precision
+    - Float values are formatted with the given precision, by default as their shortest representation
+    """
+    # Check for None/NaN/pd.NA first (before checking column type)
+    if value is None or (isinstance(value, float) and np.isnan(value)) or pd.isna(value):
+        # For float columns, output literal "NaN"; for int/others, unquoted empty
+        if col_name and col_name in float_cols_set:
+            return '"NaN"'
+        # Int columns and all other types output empty for None/NaN
+        return ''
+    # Handle datetime columns
+    if col_name and col_name in datetime_cols_set:
+        # Use isoformat() and replace microseconds
+        iso_str = value.isoformat(timespec='seconds')
+        # Normalize +00:00 to Z for consistency
+        if iso_str.endswith('+00:00'):
+            iso_str = iso_str[:-6] + 'Z'
+        return f'"{iso_str}"'
+    # Handle geometry columns
+    if col_name and col_name in geometry_cols_set:
+        str_value = to_wkt(value, precision)
+        return f'"{str_value}"'
+    # Handle int columns - convert float to int if needed
+    if col_name and col_name in int_cols_set:
+        # Convert to int first (handles case where pandas converted int to float due to None)
+        if isinstance(value, float):
+            int_value = int(value)
+        else:
+            int_value = value
+        return f'"{int_value}"'
+    if isinstance(precision, FloatPrecision) and precision.pattern and isinstance(value, (float, np.floating)):
+        str_value = precision.pattern % value
+    else:
+        # Convert to string and quote it
+        str_value = str(value)
+    # Escape quotes by doubling them
+    str_value = str_value.replace('"', '""')
+    return f'"{str_value}"'
+
+
+def to_wkt(geometries: Any, precision: Optional[Precision]) -> Any:
+    """Convert a geometry or an array of geometries to WKT, with the default precision of shapely if None."""
+    if not isinstance(precision, GeometryPrecision):
+        return shapely.to_wkt(geometries)
+    if precision.grid_size is not None:
+        geometries = shapely.set_precision(geometries, precision.grid_size)
+    return shapely.to_wkt(geometries, rounding_precision=precision.rounding_precision, trim=precision.trim)
+
+
+def quote(values: List[str]) -> List[str]:
+    """Quote text values and escape the quotes within them by doubling them.
+
+    The values are joined, escaped and split again at once, unless a value contains the NUL character
+    that separates them.
+    """
+    joined = '\0'.join(values)
+    if joined.count('\0') != len(values) - 1:
+        return ['"' + value.replace('"', '""') + '"' for value in values]
+    return ('"' + joined.replace('"', '""').replace('\0', '"\0"') + '"').split('\0')
+
+
+def _format_datetimes(column: pd.Series):
+    """Format datetime64 values like `Timestamp.isoformat(timespec='seconds')`, with Z for a UTC offset."""
+    if not pd.api.types.is_datetime64_any_dtype(column.dtype):
+        return None, None
+    index = pd.DatetimeIndex(column)
+    mask = np.asarray(index.isna())
+    wall = index if index.tz is None else index.tz_localize(None)
+    # the cast to seconds truncates fractional seconds towards the past, like isoformat
+    text = np.datetime_as_string(wall.values[~mask].astype('datetime64[s]'), unit='s')
+    if index.tz is None:
+        return mask, text.tolist()
+
+    offsets = np.asarray((wall - index.tz_convert(None)).total_seconds())[~mask]
+    if np.any(offsets % 60 != 0):
+        # isoformat writes offsets with seconds, which do not occur in practice
+        return None, None
+    offsets = offsets.astype(np.int64)
+    unique, inverse = np.unique(offsets, return_inverse=True)
+    suffixes = np.array([_format_offset(int(offset)) for offset in unique])
+    return mask, np.char.add(text, suffixes[inverse] if len(unique) > 0 else '').tolist()
+
+
+def _format_offset(seconds: int) -> str:
+    if seconds == 0:
+        return 'Z'
+    hours, minutes = divmod(abs(seconds) // 60, 60)
+    return f"{'+' if seconds > 0 else '-'}{hours:02d}:{minutes:02d}"
+
+
+def _format_geometries(column: pd.Series, precision: Optional[Precision]):
+    """Format shapely geometries as WKT in a single call."""
+    values = np.asarray(column, dtype=object)
+    mask = np.asarray(pd.isna(values), dtype=bool)
+    present = values[~mask]
+    if not shapely.is_geometry(present).all():
+        return None, None
+    return mask, to_wkt(present, precision).tolist()
+
+
+def _format_scalars(column: pd.Series, as_int: bool, precision: Optional[Precision]):
+    """Format numbers like `str`, floats of int columns truncated like `int`, and text with its quotes escaped."""
+    dtype = column.dtype
+    mask = np.asarray(column.isna(), dtype=bool)
+    if pd.api.types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype):
+        return _format_numbers(column, mask, as_int, precision)
+    if as_int:
+        # the text of int columns is written without escaping its quotes
+        return None, None
+    values = np.asarray(column, dtype=object)[~mask]
+    if pd.api.types.infer_dtype(values, skipna=False) not in ('string', 'empty'):
+        return None, None
+    return mask, values.tolist()
+
+
+def _format_numbers(column: pd.Series, mask: np.ndarray, as_int: bool, precision: Optional[Precision]):
+    # the values of NumPy columns are Python scalars, those of masked arrays are NumPy scalars
+    dtype = column.dtype
+    numpy_dtype = np.dtype(getattr(dtype, 'numpy_dtype', dtype))
+    if numpy_dtype.kind not in 'biuf':
+        return None, None
+    if numpy_dtype.kind == 'f' and not hasattr(dtype, 'numpy_dtype'):
+        numpy_dtype = np.dtype(np.float64)
+    values = column.to_numpy(dtype=numpy_dtype, na_value=0)
+    if numpy_dtype.kind == 'f':
+        # NaN values of masked arrays are not missing for pandas, but are written as missing
+        mask = mask | np.isnan(values)
+    values = values[~mask]
+    if as_int and numpy_dtype.kind == 'f':
+        if numpy_dtype != np.float64 or not np.all(np.abs(values) < 2.0 ** 63):
+            # only Python floats are truncated, int() fails for infinite values
+            return None, None
+        values = values.astype(np.int64)
+    if numpy_dtype.kind == 'f' and not as_int and isinstance(precision, FloatPrecision) and precision.pattern:
+        return mask, list(map(precision.pattern.__mod__, values.tolist()))
+    if numpy_dtype.kind == 'f' and numpy_dtype != np.float64:
+        # NumPy writes the shortest representation of the float32 values like str() of NumPy scalars
+        return mask, values.astype(str).tolist()
+    # str() of Python scalars is faster than the conversion of NumPy into strings, and is what is written
+    return mask, list(map(str, values.tolist()))
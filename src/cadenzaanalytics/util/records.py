@@ -0,0 +1,107 @@
+from typing import List, Optional
+
+import numpy as np
+
+# Number of bytes of CSV data that are scanned at once
+_SCAN_BLOCK_SIZE = 1 << 20
+_QUOTE, _SEMICOLON, _CR, _LF = 34, 59, 13, 10
+_ZERO, _X = 48, 120
+
+
+def has_unquoted_values(data: np.ndarray) -> bool:
+    """Whether CSV data, starting at the line break of its header, has values outside of quotes.
+
+    These are values that are not quoted but not empty either, characters other than a semicolon or a
+    line break after a closing quote, as well as CR or LF outside of quoted values that are not part of a
+    CRLF. Only positions that are followed by such a character are checked for whether an even number of
+    quotes precedes them, i.e. whether they are outside of quoted values. Without such values, every quote
+    opens or closes a quoted value or is part of an escaped quote.
+    """
+    quotes_before = 0
+    for start in range(0, len(data), _SCAN_BLOCK_SIZE):
+        block = data[start:start + _SCAN_BLOCK_SIZE + 1]
+        current, following = block[:-1], block[1:]
+        # the first values of the rows and the values after semicolons are quoted, empty or followed by a semicolon
+        value_starts = (((current == _SEMICOLON) | (current == _LF)) & (following != _QUOTE)
+                        & (following != _SEMICOLON) & (following != _CR))
+        line_breaks = ((following == _LF) & (current != _CR)) | ((current == _CR) & (following != _LF))
+        candidates = np.flatnonzero(value_starts | line_breaks) + 1
+        quotes = np.flatnonzero(current == _QUOTE)
+        if len(candidates) > 0 and np.any((np.searchsorted(quotes, candidates) + quotes_before) % 2 == 0):
+            return True
+        # a quote closes a quoted value if an even number of quotes ends with it, unless it is escaped
+        # by the quote that follows it
+        after_quotes = following[quotes]
+        closing = (np.arange(1, len(quotes) + 1) + quotes_before) % 2 == 0
+        if np.any(closing & (after_quotes != _QUOTE) & (after_quotes != _SEMICOLON)
+                  & (after_quotes != _CR) & (after_quotes != _LF)):
+            return True
+        quotes_before += len(quotes)
+    return False
+
+
+def has_quoted_line_breaks(data: np.ndarray) -> bool:
+    """Whether CSV data, starting at the line break of its header, has a CR or LF within a quoted value.
+
+    These are the CR and LF after an odd number of quotes. The data must not have values outside of
+    quotes, see `has_unquoted_values`.
+    """
+    quotes_before = 0
+    for start in range(0, len(data), _SCAN_BLOCK_SIZE):
+        block = data[start:start + _SCAN_BLOCK_SIZE]
+        quotes = np.flatnonzero(block == _QUOTE)
+        line_breaks = np.flatnonzero((block == _CR) | (block == _LF))
+        if len(line_breaks) > 0 and np.any((np.searchsorted(quotes, line_breaks) + quotes_before) % 2 == 1):
+            return True
+        quotes_before += len(quotes)
+    return False
+
+
+def has_hex_prefixes(data: np.ndarray) -> bool:
+    """Whether CSV data has a quoted value that begins with 0x or 0X, which pyarrow reads as a hexadecimal integer."""
+    return bool(np.any((data[:-2] == _QUOTE) & (data[1:-1] == _ZERO) & ((data[2:] | 0x20) == _X)))
+
+
+def split_records(data: np.ndarray, start: int, count: int) -> List[int]:
+    """Split CSV data into up to count segments of whole records of similar size.
+
+    The data must not have values outside of quotes, see `has_unquoted_values`, so that a CRLF
+    after an even number of quotes ends a record. Segments begin at the first such CRLF after an
+    equal share of the data.
+
+    Returns the offsets of the segments, beginning with start and ending with the length of the data.
+    """
+    offsets = [start]
+    quoted = False
+    for i in range(1, count):
+        target = start + i * (len(data) - start) // count
+        if target <= offsets[-1]:
+            continue
+        # whether the target is within a quoted value, which depends on the quotes since the last offset
+        quoted ^= bool(np.count_nonzero(data[offsets[-1]:target] == _QUOTE) % 2)
+        boundary = _next_record(data, target, quoted)
+        if boundary is None or boundary >= len(data):
+            break
+        offsets.append(boundary)
+        quoted = False
+    offsets.append(len(data))
+    return offsets
+
+
+def _next_record(data: np.ndarray, position: int, quoted: bool) -> Optional[int]:
+    """Find the start of the next record, i.e. the end of the first CRLF outside of quotes from the position."""
+    window = 1 << 16
+    while position < len(data) - 1:
+        block = data[position:position + window + 1]
+        current = block[:-1]
+        crlf = np.flatnonzero((current == _CR) & (block[1:] == _LF))
+        if len(crlf) > 0:
+            # a CRLF is outside of quotes if an even number of quotes precedes it, counting the quoted state
+            quotes = np.cumsum(current == _QUOTE)[crlf] + quoted
+            outside = np.flatnonzero(quotes % 2 == 0)
+            if len(outside) > 0:
+                return position + int(crlf[outside[0]]) + 2
+        quoted ^= bool(np.count_nonzero(current == _QUOTE) % 2)
+        position += len(current)
+        window *= 2
+    return None
@@ -0,0 +1,128 @@
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from cadenzaanalytics.data.column_stats import ColumnStats
+
+# Number of the smallest distinct hashes of the values of a column that are kept to estimate its number
+# of distinct values, the estimate has a relative standard error of about 1 / sqrt(_SKETCH_SIZE)
+_SKETCH_SIZE = 1024
+
+
+class StatsCollector:
+    """Statistics of the values of a column, collected chunk by chunk.
+
+    The number of distinct values is estimated from the smallest distinct 64-bit hashes of the values
+    (a k minimum values sketch), up to the sketch size it is exact. Collectors of consecutive chunks of
+    a column can be merged.
+    """
+
+    def __init__(self) -> None:
+        self._count = 0
+        self._null_count = 0
+        self._min = None
+        self._max = None
+        self._tz = None
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+    def add_numbers(self, data: np.ndarray, mask: np.ndarray) -> None:
+        """Add numbers or datetime64 values, of which those in the mask are missing."""
+        values = data[~mask]
+        self._count += len(data)
+        self._null_count += len(data) - len(values)
+        if len(values) > 0:
+            # fmin and fmax skip NaN values unless all values are NaN
+            self._update_range(np.fmin.reduce(values), np.fmax.reduce(values))
+            self._add_hashes(pd.util.hash_array(values))
+
+    def add_values(self, values: np.ndarray) -> None:
+        """Add objects such as text or geometries, of which None and NA are missing."""
+        present = values[~pd.isna(values)]
+        self._count += len(values)
+        self._null_count += len(values) - len(present)
+        if len(present) > 0:
+            if isinstance(present[0], shapely.Geometry):
+                # geometries are hashed by their WKB instead of their much slower string representation
+                present = shapely.to_wkb(present)
+            self._add_hashes(pd.util.hash_array(present))
+
+    def add_array(self, array: Any) -> None:
+        """Add the values of a pandas or NumPy array of any dtype."""
+        dtype = array.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            codes = np.asarray(array.codes)
+            self._count += len(codes)
+            self._null_count += int(np.count_nonzero(codes < 0))
+            # only the categories that occur are counted
+            occurring = np.bincount(codes[codes >= 0], minlength=len(array.categories)) > 0
+            if occurring.any():
+                self._add_hashes(pd.util.hash_array(np.asarray(array.categories, dtype=object)[occurring]))
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            index = pd.DatetimeIndex(array)
+            self._tz = index.tz
+            self.add_numbers(index.as_unit('ns').values, np.asarray(index.isna()))
+        elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            numpy_type = np.float64 if pd.api.types.is_float_dtype(dtype) else np.int64
+            mask = np.asarray(pd.isna(array), dtype=bool)
+            self.add_numbers(pd.array(array).to_numpy(dtype=numpy_type, na_value=0), mask)
+        else:
+            self.add_values(np.asarray(array, dtype=object))
+
+    # pylint: disable=protected-access
+    def merge(self, other: "StatsCollector") -> None:
+        """Add the statistics of another chunk of the column."""
+        self._count += other._count
+        self._null_count += other._null_count
+        self._tz = self._tz or other._tz
+        if other._min is not None:
+            self._update_range(other._min, other._max)
+        self._add_hashes(other._hashes)
+
+    def to_stats(self) -> ColumnStats:
+        """Get the statistics of all values added so far."""
+        if len(self._hashes) < _SKETCH_SIZE:
+            distinct_count = len(self._hashes)
+        else:
+            # the k-th smallest of n uniformly distributed hashes is about k / n of the range of the hashes
+            distinct_count = round((_SKETCH_SIZE - 1) * 2.0 ** 64 / float(self._hashes[-1]))
+        return ColumnStats(count=self._count,
+                           null_count=self._null_count,
+                           distinct_count=distinct_count,
+                           min=self._to_scalar(self._min),
+                           max=self._to_scalar(self._max))
+
+    def _update_range(self, low: Any, high: Any) -> None:
+        if pd.isna(low):
+            # only NaN values
+            return
+        self._min = low if self._min is None else min(self._min, low)
+        self._max = high if self._max is None else max(self._max, high)
+
+    def _add_hashes(self, hashes: np.ndarray) -> None:
+        if len(self._hashes) == _SKETCH_SIZE:
+            # once the sketch is full, only hashes below its largest hash can be part of it
+            hashes = hashes[hashes < self._hashes[-1]]
+            if len(hashes) == 0:
+                return
+        self._hashes = np.unique(np.concatenate([self._hashes, hashes]))[:_SKETCH_SIZE]
+
+    def _to_scalar(self, value: Any) -> Any:
+        if isinstance(value, np.datetime64):
+            # the values of datetimes with a time zone are in UTC
+            timestamp = pd.Timestamp(value)
+            return timestamp if self._tz is None else timestamp.tz_localize('UTC').tz_convert(self._tz)
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+
+def frame_stats(df: pd.DataFrame) -> Dict[Any, ColumnStats]:
+    """Collect the statistics of the columns of a DataFrame in one pass over each column."""
+    stats = {}
+    for name, column in df.items():
+        collector = StatsCollector()
+        collector.add_array(column.array)
+        stats[name] = collector.to_stats()
+    return stats
@@ -0,0 +1,266 @@
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, TypeVar
+
+import pandas as pd
+
+from cadenzaanalytics.data.float_precision import FloatPrecision
+from cadenzaanalytics.data.geometry_precision import GeometryPrecision
+from cadenzaanalytics.util import arrow, formatting
+
+# Default number of rows that are formatted and encoded at once when CSV data is written in chunks
+CHUNK_ROWS = 10000
+
+_T = TypeVar('_T')
+_R = TypeVar('_R')
+
+
+class _Layout(NamedTuple):
+    """How the values of the columns of a DataFrame are formatted."""
+    names: List[Any]
+    float_cols_set: Set[str]
+    int_cols_set: Set[str]
+    datetime_cols_set: Set[str]
+    geometry_cols_set: Set[str]
+    precisions: Dict[str, formatting.Precision]
+
+
+# pylint: disable=too-many-arguments
+def to_cadenza_csv(
+    df: pd.DataFrame,
+    datetime_columns: Optional[List[str]] = None,
+    geometry_columns: Optional[List[str]] = None,
+    float_columns: Optional[List[str]] = None,
+    int_columns: Optional[List[str]] = None,
+    geometry_precision: Optional[Dict[str, GeometryPrecision]] = None,
+    float_precision: Optional[Dict[str, FloatPrecision]] = None,
+    *,
+    max_workers: int = 1,
+    executor: Optional[Executor] = None,
+    chunk_rows: int = CHUNK_ROWS
+) -> str:
+    """Convert a pandas DataFrame to Cadenza CSV format.
+
+    Cadenza CSV specs:
+    - Text encoding is UTF-8
+    - Values are separated by semicolons (;)
+    - Values enclosed by double quotes (") are considered present
+    - Values not quoted are considered None/Null/missing
+    - Numbers are decimal with dot (.) as decimal separator
+    - Lines separated by CRLF (\\r\\n)
+    - DateTimes follow ISO8601 format (e.g., 2023-01-03T15:29:13Z)
+    - Geometries are converted to WKT strings
+    - Float columns with NaN values output as the literal string "NaN" (quoted)
+    - Int columns with None values output as empty/unquoted (not "NaN")
+    - Arrow-backed string, integer, double and timestamp columns are formatted by pyarrow
+    - Numeric, text, datetime and geometry columns are formatted as a whole, other columns value by value
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The DataFrame to convert
+    datetime_columns : Optional[List[str]]
+        List of column names to format as ISO8601 datetimes
+    geometry_columns : Optional[List[str]]
+        List of column names to convert from shapely geometries to WKT
+    float_columns : Optional[List[str]]
+        List of column names that are float types (NaN will be output as "NaN")
+    int_columns : Optional[List[str]]
+        List of column names that are int types (None will be output as empty)
+    geometry_precision : Optional[Dict[str, GeometryPrecision]]
+        Precision of the WKT of geometry columns by column name, shapely's default precision of 6 decimals
+        for geometry columns without one
+    float_precision : Optional[Dict[str, FloatPrecision]]
+        Precision of the values of float columns by column name, the shortest representation of the values
+        for float columns without one
+    max_workers : int
+        Maximum number of chunks of chunk_rows rows that are formatted in parallel. With 1 and without an
+        executor, all rows are formatted at once on the calling thread.
+    executor : Optional[Executor]
+        Executor on which the chunks are formatted, e.g. a ProcessPoolExecutor. Without an executor, they
+        are formatted on a thread pool of max_workers threads.
+    chunk_rows : int
+        Number of rows per chunk if the rows are formatted in parallel. DataFrames with at most that many
+        rows are always formatted on the calling thread.
+
+    Returns
+    -------
+    str
+        CSV data as a string
+    """
+    parallel = executor is not None or max_workers > 1
+    return ''.join(_iter_csv_text(df, _layout(df, datetime_columns, geometry_columns, float_columns, int_columns,
+                                              geometry_precision, float_precision),
+                                  chunk_rows if parallel else None, max_workers, executor))
+
+
+# pylint: disable=too-many-arguments
+def iter_cadenza_csv(
+    df: pd.DataFrame,
+    datetime_columns: Optional[List[str]] = None,
+    geometry_columns: Optional[List[str]] = None,
+    float_columns: Optional[List[str]] = None,
+    int_columns: Optional[List[str]] = None,
+    geometry_precision: Optional[Dict[str, GeometryPrecision]] = None,
+    float_precision: Optional[Dict[str, FloatPrecision]] = None,
+    chunk_rows: int = CHUNK_ROWS,
+    *,
+    max_workers: int = 1,
+    executor: Optional[Executor] = None
+) -> Iterator[bytes]:
+    """Convert a pandas DataFrame to Cadenza CSV format in chunks of UTF-8 encoded bytes.
+
+    The chunks joined are the encoded result of `to_cadenza_csv`. Only the rows of a few chunks are
+    formatted at a time, so that the CSV data never has to be held in memory as a whole. `b''.join()`
+    of the chunks gives the UTF-8 encoded CSV data without creating the text of all rows first.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The DataFrame to convert
+    datetime_columns : Optional[List[str]]
+        List of column names to format as ISO8601 datetimes
+    geometry_columns : Optional[List[str]]
+        List of column names to convert from shapely geometries to WKT
+    float_columns : Optional[List[str]]
+        List of column names that are float types (NaN will be output as "NaN")
+    int_columns : Optional[List[str]]
+        List of column names that are int types (None will be output as empty)
+    geometry_precision : Optional[Dict[str, GeometryPrecision]]
+        Precision of the WKT of geometry columns by column name, shapely's default precision of 6 decimals
+        for geometry columns without one
+    float_precision : Optional[Dict[str, FloatPrecision]]
+        Precision of the values of float columns by column name, the shortest representation of the values
+        for float columns without one
+    chunk_rows : int
+        Number of rows per chunk, the first chunk holds the header.
+    max_workers : int
+        Maximum number of chunks that are formatted in parallel, ahead of the chunk that is yielded.
+        With 1 and without an executor, the chunks are formatted on the calling thread one by one.
+    executor : Optional[Executor]
+        Executor on which the chunks are formatted, e.g. a ProcessPoolExecutor. Without an executor, they
+        are formatted on a thread pool of max_workers threads.
+
+    Yields
+    ------
+    bytes
+        Consecutive chunks of the CSV data
+    """
+    layout = _layout(df, datetime_columns, geometry_columns, float_columns, int_columns,
+                     geometry_precision, float_precision)
+    for text in _iter_csv_text(df, layout, chunk_rows, max_workers, executor):
+        yield text.encode('utf-8')
+
+
+# pylint: disable=too-many-arguments
+def _layout(
+    df: pd.DataFrame,
+    datetime_columns: Optional[List[str]],
+    geometry_columns: Optional[List[str]],
+    float_columns: Optional[List[str]],
+    int_columns: Optional[List[str]],
+    geometry_precision: Optional[Dict[str, GeometryPrecision]],
+    float_precision: Optional[Dict[str, FloatPrecision]]
+) -> _Layout:
+    return _Layout(names=df.columns.tolist(),
+                   float_cols_set=set(float_columns) if float_columns else set(),
+                   int_cols_set=set(int_columns) if int_columns else set(),
+                   datetime_cols_set=set(datetime_columns) if datetime_columns else set(),
+                   geometry_cols_set=set(geometry_columns) if geometry_columns else set(),
+                   precisions={**(float_precision or {}), **(geometry_precision or {})})
+
+
+def _iter_csv_text(
+    df: pd.DataFrame,
+    layout: _Layout,
+    chunk_rows: Optional[int],
+    max_workers: int,
+    executor: Optional[Executor]
+) -> Iterator[str]:
+    """Format the header and then chunk_rows rows at a time, all rows at once if chunk_rows is None.
+
+    The chunks are formatted on the executor, or on a thread pool with more than one worker, if there
+    is more than one chunk.
+    """
+    if df.empty and len(df.columns) == 0:
+        return
+
+    # Write header (no special formatting for header row)
+    header = ';'.join(formatting.format_value(name, None, set(), set(), set(), set()) for name in layout.names)
+    if len(df) == 0:
+        yield header + '\r\n'
+        return
+
+    columns = [formatting.widen_floats(df.iloc[:, i]) if col_name and col_name in layout.float_cols_set
+               else df.iloc[:, i]
+               for i, col_name in enumerate(layout.names)]
+    step = chunk_rows or len(df)
+    chunks = ([column.iloc[start:start + step] for column in columns] for start in range(0, len(df), step))
+    format_rows = partial(_format_rows, layout=layout)
+    if len(df) > step and (executor is not None or max_workers > 1):
+        texts = _map_in_order(format_rows, chunks, executor, max_workers)
+    else:
+        texts = map(format_rows, chunks)
+
+    for i, text in enumerate(texts):
+        yield header + '\r\n' + text if i == 0 else text
+
+
+def _map_in_order(function: Callable[[_T], _R],
+                  items: Iterable[_T],
+                  executor: Optional[Executor],
+                  max_workers: int) -> Iterator[_R]:
+    """Apply the function to the items on the executor and yield the results in the order of the items.
+
+    At most twice as many items as max_workers are submitted ahead of the result that is yielded, so that
+    the results of all items are not held at once.
+    """
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=max_workers) as own_executor:
+            yield from _map_in_order(function, items, own_executor, max_workers)
+        return
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(function, item))
+        if len(pending) > 2 * max_workers:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _format_rows(columns: List[pd.Series], layout: _Layout) -> str:
+    """Format the rows of the columns, each row ending with a line break."""
+    formatted_columns = [
+        _format_column(column, col_name, layout.float_cols_set, layout.int_cols_set, layout.datetime_cols_set,
+                       layout.geometry_cols_set, layout.precisions.get(col_name))
+        for column, col_name in zip(columns, layout.names)]
+    lines = list(map(';'.join, zip(*formatted_columns)))
+    # the empty last line ends the last row with a line break without copying the text once more
+    lines.append('')
+    return '\r\n'.join(lines)
+
+
+# pylint: disable=too-many-arguments
+def _format_column(
+    column: pd.Series,
+    col_name: Any,
+    float_cols_set: Set[str],
+    int_cols_set: Set[str],
+    datetime_cols_set: Set[str],
+    geometry_cols_set: Set[str],
+    precision: Optional[formatting.Precision]
+) -> List[str]:
+    """Format the values of a column with pyarrow, with vectorized operations or value by value."""
+    formatted = None
+    if not isinstance(precision, FloatPrecision):
+        formatted = arrow.format_column(column, col_name, float_cols_set, int_cols_set,
+                                         datetime_cols_set, geometry_cols_set)
+    if formatted is None:
+        formatted = formatting.format_column(column, col_name, float_cols_set, int_cols_set,
+                                             datetime_cols_set, geometry_cols_set, precision)
+    if formatted is None:
+        formatted = [formatting.format_value(value, col_name, float_cols_set, int_cols_set,
+                                             datetime_cols_set, geometry_cols_set, precision)
+                     for value in column]
+    return formatted